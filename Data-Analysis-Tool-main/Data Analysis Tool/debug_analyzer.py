@@ -4,22 +4,78 @@
 Debug tool to inspect Toast data structure
 """
 
-from restaurant_ai_analyzer import RestaurantDataAI
+from restaurant_ai_analyzer import EXCEL_ENGINE
 import pandas as pd
+import argparse
+import contextlib
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
-def debug_toast_data():
+DEFAULT_FILE = "SalesSummary_2025-05-01_2025-05-31.xlsx"
+
+# Rows to sample per sheet - plenty for the preview and column detection
+INSPECT_ROWS = 200
+
+def sheet_row_count(excel_file, sheet_name):
+    """Count data rows from the workbook's sheet dimensions without building a DataFrame"""
+    if excel_file.engine == "calamine":
+        height = excel_file.book.get_sheet_by_name(sheet_name).height
+    elif excel_file.engine == "xlrd":
+        height = excel_file.book.sheet_by_name(sheet_name).nrows
+    else:
+        height = excel_file.book[sheet_name].max_row
+    return max(height - 1, 0)  # exclude the header row
+
+def _inspect_sheet(args):
+    """Sample one sheet and detect its columns - runs in a worker process"""
+    from restaurant_ai_analyzer import RestaurantDataAI
+    
+    file_path, sheet_name = args
+    try:
+        excel_file = pd.ExcelFile(file_path, engine=EXCEL_ENGINE)
+        df = pd.read_excel(excel_file, sheet_name=sheet_name, nrows=INSPECT_ROWS)
+        
+        # Quick analysis potential (detection output is summarized by the parent)
+        analyzer = RestaurantDataAI()
+        analyzer.data = df
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer._auto_detect_columns()
+        
+        # Plain pipe-separated preview - much cheaper than the pandas table formatter
+        sample = None
+        if len(df) > 0:
+            buf = io.StringIO()
+            df.head(2).iloc[:, :6].to_csv(buf, sep="|", index=False)
+            sample = buf.getvalue()
+        
+        return {
+            'sheet': sheet_name,
+            'total_rows': sheet_row_count(excel_file, sheet_name),
+            'sampled_rows': len(df),
+            'columns': df.columns.tolist(),
+            'sample': sample,
+            'column_mapping': analyzer.column_mapping
+        }
+    except Exception as e:
+        return {'sheet': sheet_name, 'error': str(e)}
+
+def debug_toast_data(file_path=DEFAULT_FILE):
     """Debug what's actually in the Toast Excel file"""
     
     print("🔍 Toast Data Structure Inspector")
     print("=" * 50)
     
-    file_path = "SalesSummary_2025-05-01_2025-05-31.xlsx"
-    
     try:
-        # Load Excel file and show all sheets
-        excel_file = pd.ExcelFile(file_path)
+        # Load Excel file once and show all sheets
+        excel_file = pd.ExcelFile(file_path, engine=EXCEL_ENGINE)
         sheets = excel_file.sheet_names
         
+        # Lowercase the sheet names once for all the matching below
+        sheets_lc = [sheet.lower() for sheet in sheets]
+        sheet_set = set(sheets)
+        
         print(f"📊 Found {len(sheets)} sheets in your Toast file:")
         for i, sheet in enumerate(sheets, 1):
             print(f"   {i:2d}. {sheet}")
@@ -37,27 +93,26 @@ def debug_toast_data():
         
         print("🎯 RECOMMENDED SHEETS FOR ANALYSIS:")
         for rec in recommended:
-            if rec in sheets:
+            if rec in sheet_set:
                 print(f"   ✅ {rec}")
             else:
-                # Find similar sheets
-                similar = [s for s in sheets if any(word in s.lower() for word in rec.lower().split())]
+                # Find the first similar sheet
+                tokens = rec.lower().split()
+                similar = next((s for s, s_lc in zip(sheets, sheets_lc)
+                                if any(token in s_lc for token in tokens)), None)
                 if similar:
-                    print(f"   📋 {rec} (Try: {similar[0]})")
+                    print(f"   📋 {rec} (Try: {similar})")
                 else:
                     print(f"   ❌ {rec} (not found)")
         
         print("\n" + "=" * 50)
         
         # Analyze top 5 most promising sheets
-        promising_sheets = []
-        for rec in recommended:
-            if rec in sheets:
-                promising_sheets.append(rec)
+        promising_sheets = [rec for rec in recommended if rec in sheet_set]
         
         # Add a few more that might be good
-        for sheet in sheets:
-            if any(keyword in sheet.lower() for keyword in ['sales', 'revenue', 'day', 'time']):
+        for sheet, sheet_lc in zip(sheets, sheets_lc):
+            if any(keyword in sheet_lc for keyword in ('sales', 'revenue', 'day', 'time')):
                 if sheet not in promising_sheets:
                     promising_sheets.append(sheet)
         
@@ -66,39 +121,38 @@ def debug_toast_data():
         
         print(f"📋 INSPECTING TOP {len(promising_sheets)} SHEETS:")
         
-        for sheet_name in promising_sheets:
-            print(f"\n--- SHEET: '{sheet_name}' ---")
-            try:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-                print(f"   📊 Size: {len(df)} rows × {len(df.columns)} columns")
-                print(f"   📋 Columns: {list(df.columns)}")
+        # Parsing and column detection are CPU-bound, so inspect the sheets in parallel processes
+        workers = max(1, min(len(promising_sheets), os.cpu_count() or 1))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            jobs = [(file_path, sheet_name) for sheet_name in promising_sheets]
+            for info in executor.map(_inspect_sheet, jobs):
+                print(f"\n--- SHEET: '{info['sheet']}' ---")
+                if 'error' in info:
+                    print(f"   ❌ Error reading sheet: {info['error']}")
+                    continue
+                
+                print(f"   📊 Size: {info['total_rows']} rows × {len(info['columns'])} columns "
+                      f"({info['sampled_rows']} rows sampled)")
+                print(f"   📋 Columns: {info['columns']}")
                 
                 # Show first few rows
-                if len(df) > 0:
+                if info['sample'] is not None:
                     print(f"   📄 Sample data:")
-                    print(df.head(2).to_string(max_cols=6, max_colwidth=20))
+                    print(info['sample'], end='')
                 
-                # Quick analysis potential
-                analyzer = RestaurantDataAI()
-                analyzer.data = df
-                analyzer._auto_detect_columns()
-                
-                if analyzer.column_mapping:
-                    print(f"   🏷️  AI detected: {analyzer.column_mapping}")
+                if info['column_mapping']:
+                    print(f"   🏷️  AI detected: {info['column_mapping']}")
                 else:
                     print(f"   ⚠️  No standard columns detected")
                 
                 print()
-                
-            except Exception as e:
-                print(f"   ❌ Error reading sheet: {e}")
     
     except Exception as e:
         print(f"❌ Error: {e}")
 
-def quick_analyze_sheet(sheet_name):
-    """Quick analysis of a specific sheet"""
-    file_path = "SalesSummary_2025-05-01_2025-05-31.xlsx"
+def quick_analyze_sheet(sheet_name, file_path=DEFAULT_FILE, json_out=None):
+    """Quick analysis of a specific sheet, optionally exported to JSON"""
+    from restaurant_ai_analyzer import RestaurantDataAI
     
     print(f"\n🚀 QUICK ANALYSIS: '{sheet_name}'")
     print("=" * 50)
@@ -110,7 +164,7 @@ def quick_analyze_sheet(sheet_name):
         
         # Show basic info
         print(f"📊 Data: {len(analyzer.data)} rows × {len(analyzer.data.columns)} columns")
-        print(f"📋 Columns: {list(analyzer.data.columns)}")
+        print(f"📋 Columns: {analyzer.data.columns.tolist()}")
         
         # Show detected mappings
         if analyzer.column_mapping:
@@ -121,18 +175,38 @@ def quick_analyze_sheet(sheet_name):
         print(f"\n💡 AI INSIGHTS:")
         for insight in insights:
             print(f"   • {insight}")
+        
+        if json_out:
+            analyzer.export_analysis(json_out)
     else:
         print("❌ Failed to load sheet")
 
-if __name__ == "__main__":
+def main(argv=None):
+    """Command line entry point - runs headless when --sheet is given or stdin isn't a terminal"""
+    parser = argparse.ArgumentParser(description="Inspect the sheets of a Toast Excel export")
+    parser.add_argument("--file", default=DEFAULT_FILE, help=f"Excel file to inspect (default: {DEFAULT_FILE})")
+    parser.add_argument("--sheet", help="Sheet to run a quick AI analysis on")
+    parser.add_argument("--quick", action="store_true", help="Skip the sheet inspection and only analyze --sheet")
+    parser.add_argument("--json-out", help="Export the quick analysis of --sheet to this JSON file")
+    args = parser.parse_args(argv)
+    
+    if (args.quick or args.json_out) and not args.sheet:
+        parser.error("--quick and --json-out require --sheet")
+    
     # Run the debug analysis
-    debug_toast_data()
+    if not args.quick:
+        debug_toast_data(args.file)
     
-    # Ask user which sheet to analyze
-    print("\n" + "=" * 50)
-    sheet_choice = input("🎯 Enter sheet name to analyze (or press Enter to skip): ").strip()
+    sheet_choice = args.sheet
+    if not sheet_choice and sys.stdin.isatty():
+        # Ask user which sheet to analyze
+        print("\n" + "=" * 50)
+        sheet_choice = input("🎯 Enter sheet name to analyze (or press Enter to skip): ").strip()
     
     if sheet_choice:
-        quick_analyze_sheet(sheet_choice)
+        quick_analyze_sheet(sheet_choice, args.file, args.json_out)
     
     print("\n✅ Debug complete!")
+
+if __name__ == "__main__":
+    main()
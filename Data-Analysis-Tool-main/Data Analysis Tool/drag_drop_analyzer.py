@@ -7,7 +7,16 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import os
 import threading
-from restaurant_ai_analyzer import RestaurantDataAI
+from collections import deque
+from pathlib import Path
+import pandas as pd
+from restaurant_ai_analyzer import RestaurantDataAI, EXCEL_ENGINE
+
+# Cap the results log so repeated analyses don't grow the widget without bound
+MAX_LOG_LINES = 5000
+TRIM_LOG_LINES = 1000
+
+EXCEL_EXTENSIONS = frozenset({'.xlsx', '.xls'})
 
 class DragDropAnalyzer:
     def __init__(self):
@@ -17,6 +26,12 @@ class DragDropAnalyzer:
         self.root.configure(bg='#f0f0f0')
         
         self.analyzer = RestaurantDataAI()
+        
+        # Log lines queued by worker threads, flushed to the widget in batches
+        self._log_buffer = deque()
+        self._log_lock = threading.Lock()
+        self._flush_pending = False
+        
         self.setup_gui()
         
     def setup_gui(self):
@@ -106,7 +121,8 @@ class DragDropAnalyzer:
             width=90,
             font=("Consolas", 9),
             bg='#ffffff',
-            fg='#2c3e50'
+            fg='#2c3e50',
+            state='disabled'
         )
         self.results_text.pack(pady=5, padx=20, fill='both', expand=True)
         
@@ -160,7 +176,9 @@ class DragDropAnalyzer:
             return
         
         # Clear previous results
+        self.results_text.config(state='normal')
         self.results_text.delete(1.0, tk.END)
+        self.results_text.config(state='disabled')
         
         # Update drop zone
         file_name = os.path.basename(file_path)
@@ -181,21 +199,19 @@ class DragDropAnalyzer:
             self.log_message(f"🔍 Loading {file_name}...")
             
             # Load the data
-            file_ext = os.path.splitext(file_path.lower())[1]
-            
-            if file_ext in ['.xlsx', '.xls']:
+            if Path(file_path).suffix.lower() in EXCEL_EXTENSIONS:
                 # Handle Excel files
-                import pandas as pd
-                excel_file = pd.ExcelFile(file_path)
+                excel_file = pd.ExcelFile(file_path, engine=EXCEL_ENGINE)
                 sheet_names = excel_file.sheet_names
                 
                 if len(sheet_names) > 1:
                     # Use first sheet for now - could add sheet selection later
                     sheet_name = sheet_names[0]
                     self.log_message(f"📊 Using sheet: {sheet_name}")
-                    success = self.analyzer.load_data(file_path, sheet_name=sheet_name)
+                    success = self.analyzer.load_data(file_path, sheet_name=sheet_name, excel_file=excel_file)
                 else:
-                    success = self.analyzer.load_data(file_path)
+                    success = self.analyzer.load_data(file_path, excel_file=excel_file)
+                excel_file.close()
             else:
                 success = self.analyzer.load_data(file_path)
             
@@ -203,8 +219,7 @@ class DragDropAnalyzer:
                 self.log_message("✅ Data loaded successfully!")
                 
                 # Show data overview
-                rows = len(self.analyzer.data)
-                cols = len(self.analyzer.data.columns)
+                rows, cols = self.analyzer.data.shape
                 self.log_message(f"📋 Data Overview: {rows:,} rows, {cols} columns")
                 
                 # Generate insights
@@ -253,12 +268,32 @@ class DragDropAnalyzer:
     
     def log_message(self, message):
         """Add message to results area"""
-        def update_text():
-            self.results_text.insert(tk.END, message + "\n")
-            self.results_text.see(tk.END)
+        with self._log_lock:
+            self._log_buffer.append(message)
+            if self._flush_pending:
+                return
+            self._flush_pending = True
+        
+        # Call from main thread - one flush covers every message queued until it runs
+        self.root.after(30, self._flush_logs)
+    
+    def _flush_logs(self):
+        """Write all queued messages to the results area in a single insert"""
+        with self._log_lock:
+            lines = list(self._log_buffer)
+            self._log_buffer.clear()
+            self._flush_pending = False
+        
+        self.results_text.config(state='normal')
+        self.results_text.insert(tk.END, "\n".join(lines) + "\n")
+        
+        # Drop the oldest block of lines in one call once the log gets too long
+        line_count = int(self.results_text.index('end-1c').split('.')[0])
+        if line_count > MAX_LOG_LINES:
+            self.results_text.delete('1.0', f'{TRIM_LOG_LINES + 1}.0')
         
-        # Call from main thread
-        self.root.after(0, update_text)
+        self.results_text.config(state='disabled')
+        self.results_text.see(tk.END)
     
     def export_analysis(self):
         """Export analysis results"""
@@ -30,6 +30,10 @@ def main():
         "matplotlib",
         "seaborn",
         "openpyxl",
+        "python-calamine",
+        "pyarrow",
+        "orjson",
+        "numba",
         "xlrd",
         "xlsxwriter",
         "customtkinter"
@@ -4,8 +4,390 @@ from datetime import datetime, timedelta
 import json
 from typing import Dict, List, Tuple, Any
 import re
+import heapq
 from collections import defaultdict
+from functools import lru_cache, wraps
 import os
+import hashlib
+import zipfile
+import xml.etree.ElementTree as ET
+
+# Prefer the Rust-based calamine reader for Excel files; it parses XLSX several
+# times faster than openpyxl with a fraction of the memory. None lets pandas
+# pick its default engine (openpyxl/xlrd) when python-calamine isn't installed.
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
+# Parsed Excel sheets are cached as Parquet files when pyarrow is available,
+# and CSVs go through its multithreaded reader instead of the single-threaded C parser
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_CACHE = True
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    PARQUET_CACHE = False
+    CSV_ENGINE = "c"
+
+# Per-user folder for the Parquet copies, so nothing is written next to the user's data files
+PARQUET_CACHE_DIR = os.path.join(
+    os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+    'restaurant-data-analysis'
+)
+
+# Numba compiles the single-pass sales aggregation and column statistics; numpy is the fallback
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# orjson writes the export several times faster and handles numpy values natively
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Label columns are stored as categories only below this ratio of distinct values to rows
+CATEGORY_RATIO = 0.5
+
+# Keywords that identify each kind of restaurant data column (enhanced patterns with more variations)
+COLUMN_KEYWORDS = {
+    'date': ['date', 'time', 'created', 'order_date', 'timestamp', 'day', 'week', 'month'],
+    'item_name': ['item', 'product', 'menu', 'name', 'description', 'dish'],
+    'price': ['price', 'amount', 'total', 'cost', 'revenue', 'sales', 'value'],
+    'quantity': ['qty', 'quantity', 'count', 'units', 'orders', 'sold'],
+    'category': ['category', 'type', 'group', 'section', 'department'],
+    'payment': ['payment', 'method', 'card', 'cash', 'tender'],
+    'employee': ['employee', 'staff', 'server', 'cashier', 'waiter'],
+    'order_id': ['order', 'ticket', 'transaction', 'receipt', 'id'],
+    'customer': ['customer', 'guest', 'phone', 'email', 'patron']
+}
+COLUMN_PATTERNS = {data_type: re.compile('|'.join(map(re.escape, keywords)))
+                   for data_type, keywords in COLUMN_KEYWORDS.items()}
+
+# Weekday names indexed by Series.dt.dayofweek (Monday=0)
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Fixed strategic recommendations, added as a block when their condition holds
+GROWTH_MARKETING = (
+    "📱 Implement social media advertising campaign - target 25% customer increase",
+    "🎁 Create loyalty program to increase repeat visits by 30%",
+    "📧 Launch email marketing to inactive customers from your POS database",
+)
+PREMIUM_MARKETING = (
+    "⭐ Focus on premium offerings - you have strong customer base",
+    "📈 Upselling training for staff to increase average ticket size",
+    "🏆 Implement VIP program for high-value customers",
+)
+WEEKLY_OPERATIONS = (
+    "📅 Analyze daily patterns to optimize staff scheduling",
+    "🍽️ Review menu performance - identify low-performing items to remove",
+    "⏰ Implement peak-hour operational efficiency improvements",
+)
+REVENUE_TACTICS = (
+    "🎯 Focus on high-margin items - conduct menu engineering analysis",
+    "💳 Optimize payment processing - reduce transaction times by 20%",
+    "🥤 Implement strategic upselling - beverages and appetizers",
+)
+LONG_TERM_STRATEGY = (
+    "📊 Implement advanced POS analytics for real-time decision making",
+    "🏪 Consider expansion opportunities based on current performance trends",
+    "🤖 Automate inventory management to reduce waste by 10-15%",
+    "👥 Develop staff performance incentives tied to customer satisfaction",
+    "📈 Create quarterly business reviews using data-driven insights",
+)
+
+# Fixed pieces of the insights report, built once instead of on every report
+REPORT_RULE = "─" * 50
+REPORT_HEADER = ("═══ 🎯 BUSINESS STRATEGY & INTELLIGENCE REPORT ═══", "")
+ACTION_PLAN_SECTIONS = (
+    ("🎯 IMMEDIATE ACTION PLAN (Next 30 Days)", 'immediate_actions'),
+    ("📈 MARKETING & GROWTH STRATEGIES (1-3 Months)", 'marketing_strategies'),
+    ("⚙️ OPERATIONAL IMPROVEMENTS", 'operational_improvements'),
+    ("💰 REVENUE OPTIMIZATION TACTICS", 'revenue_optimization'),
+)
+# Revenue impact projections: (name, share of monthly revenue, strategy)
+IMPACT_STRATEGIES = (
+    ('customer_acquisition_25%', 0.25, 'Marketing campaigns and promotions'),
+    ('average_ticket_15%', 0.15, 'Upselling and menu optimization'),
+    ('operational_efficiency_10%', 0.10, 'Improved processes and waste reduction'),
+    ('combined_impact', 0.50, 'All recommendations implemented'),  # Combined effect
+)
+IMPACT_LABELS = {name: name.replace('_', ' ').title() for name, _, _ in IMPACT_STRATEGIES}
+NEXT_STEPS = (
+    "✅ NEXT STEPS",
+    REPORT_RULE,
+    "1. 📋 Review and prioritize the immediate action items above",
+    "2. 🎯 Select 2-3 marketing strategies to implement this month",
+    "3. 💰 Track progress weekly and adjust strategies based on results",
+    "4. 📊 Schedule monthly data reviews to monitor improvement",
+    "",
+    "═══ 📈 YOUR BUSINESS SUCCESS ROADMAP IS READY! ═══",
+)
+
+def list_sheet_names(file_path: str) -> List[str]:
+    """List sheet names from the .xlsx workbook index without loading any sheet data"""
+    if not zipfile.is_zipfile(file_path):
+        # Legacy .xls files aren't ZIP archives - let pandas read the sheet list
+        with pd.ExcelFile(file_path, engine=EXCEL_ENGINE) as excel_file:
+            return excel_file.sheet_names
+    
+    with zipfile.ZipFile(file_path) as z, z.open("xl/workbook.xml") as f:
+        return [el.get("name") for _, el in ET.iterparse(f) if el.tag.endswith("}sheet")]
+
+def _date_keys(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Split datetime64 values into unique days, day ids, hours of day and weekdays (Monday=0)"""
+    day_values = values.astype('datetime64[D]')
+    days, day_ids = np.unique(day_values, return_inverse=True)
+    hours = (values - day_values) // np.timedelta64(1, 'h')
+    weekdays = (day_values.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    return days, day_ids, hours, weekdays
+
+def _sales_totals(prices, hours, weekdays, day_ids, n_days):
+    """Hourly, weekday and daily sales totals plus hourly/weekday order counts"""
+    return (np.bincount(hours, weights=prices, minlength=24),
+            np.bincount(hours, minlength=24),
+            np.bincount(weekdays, weights=prices, minlength=7),
+            np.bincount(weekdays, minlength=7),
+            np.bincount(day_ids, weights=prices, minlength=n_days))
+
+def _sales_totals_loop(prices, hours, weekdays, day_ids, n_days):
+    """Same totals as _sales_totals, accumulated in one pass over the rows (compiled by numba)"""
+    hourly = np.zeros(24)
+    hourly_count = np.zeros(24, np.int64)
+    weekly = np.zeros(7)
+    weekly_count = np.zeros(7, np.int64)
+    daily = np.zeros(n_days)
+    for i in range(prices.size):
+        p = prices[i]
+        hourly[hours[i]] += p
+        hourly_count[hours[i]] += 1
+        weekly[weekdays[i]] += p
+        weekly_count[weekdays[i]] += 1
+        daily[day_ids[i]] += p
+    return hourly, hourly_count, weekly, weekly_count, daily
+
+if njit is not None:
+    # Serial on purpose - parallel increments into the shared bins would race
+    _sales_totals = njit(cache=True)(_sales_totals_loop)
+
+def _column_stats(values, total):
+    """Mean, max, min, sample std and first/second-half means of a non-empty float array"""
+    if values.size < 2:
+        return total, values[0], values[0], 0.0, 0.0, 0.0
+    half = values.size // 2
+    return (total / values.size, values.max(), values.min(), values.std(ddof=1),
+            values[:half].mean(), values[half:].mean())
+
+def _column_stats_loop(values, total):
+    """Same statistics as _column_stats from two passes over the values (compiled by numba)
+    
+    The total comes from numpy's pairwise sum so it matches the pandas figures exactly.
+    """
+    n = values.size
+    half = n // 2
+    first_total = 0.0
+    maximum = values[0]
+    minimum = values[0]
+    for i in range(n):
+        v = values[i]
+        if i < half:
+            first_total += v
+        if v > maximum:
+            maximum = v
+        if v < minimum:
+            minimum = v
+    mean = total / n
+    if n < 2:
+        return mean, maximum, minimum, 0.0, 0.0, 0.0
+    squares = 0.0
+    for i in range(n):
+        squares += (values[i] - mean) ** 2
+    return (mean, maximum, minimum, (squares / (n - 1)) ** 0.5,
+            first_total / half, (total - first_total) / (n - half))
+
+if njit is not None:
+    _column_stats = njit(cache=True)(_column_stats_loop)
+
+def _trend_label(first_half: float, second_half: float) -> str:
+    """Classify the change between the two halves of a series"""
+    change_percent = ((second_half - first_half) / first_half * 100) if first_half != 0 else 0
+    
+    if change_percent > 5:
+        return "increasing"
+    elif change_percent < -5:
+        return "decreasing"
+    else:
+        return "stable"
+
+def _failed(result: Dict[str, Any]) -> bool:
+    """Whether an analysis returned {"error": message} - a summary column named 'error' doesn't count"""
+    return isinstance(result.get('error'), str)
+
+def _top_rows(frame: pd.DataFrame, column: str, n: int = 5) -> pd.DataFrame:
+    """Rows with the n largest values in column - nlargest(keep='first') via a partition, not a sort"""
+    values = frame[column].to_numpy()
+    if len(values) > n:
+        # Everything tied with the n-th largest value stays a candidate, so ties keep row order
+        kth = np.partition(values, -n)[-n]
+        candidates = np.flatnonzero(values >= kth)
+    else:
+        candidates = np.arange(len(values))
+    order = candidates[np.argsort(-values[candidates], kind='stable')][:n]
+    return frame.iloc[order]
+
+def _cached(key):
+    """Memoize an analysis method's result until the next load_data call
+    
+    The cache is also dropped when self.data is swapped out or its type changes.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self):
+            fingerprint = (id(self.data), 0 if self.data is None else len(self.data), self.data_type)
+            if self._cache_key != fingerprint:
+                self._cache.clear()
+                self._cache_key = fingerprint
+            if key not in self._cache:
+                self._cache[key] = method(self)
+            return self._cache[key]
+        return wrapper
+    return decorator
+
+class StreamingAggregator:
+    """Running sales and menu totals for a CSV that is processed chunk by chunk"""
+    
+    def __init__(self, column_mapping: Dict[str, str]):
+        self.date_col = column_mapping.get('date')
+        self.price_col = column_mapping.get('price')
+        self.item_col = column_mapping.get('item_name')
+        self.qty_col = column_mapping.get('quantity')
+        self.rows = 0
+        
+        # Sales trends
+        self.hourly_sum = np.zeros(24)
+        self.hourly_count = np.zeros(24, dtype=np.int64)
+        self.weekday_sum = np.zeros(7)
+        self.weekday_count = np.zeros(7, dtype=np.int64)
+        self.daily_sum = defaultdict(float)
+        self.sales_error = None
+        
+        # Menu performance
+        self.item_sum = defaultdict(float)
+        self.item_count = defaultdict(int)
+        self.item_qty = defaultdict(int)
+        self.price_sum = 0.0
+        self.price_count = 0
+        self.menu_error = None
+    
+    def update(self, chunk: pd.DataFrame):
+        """Fold one chunk into the running totals"""
+        self.rows += len(chunk)
+        if self.price_col is None:
+            return
+        
+        if self.date_col is not None and self.sales_error is None:
+            try:
+                self._update_sales(chunk)
+            except Exception as e:
+                self.sales_error = str(e)
+        
+        if self.item_col is not None and self.menu_error is None:
+            try:
+                self._update_menu(chunk)
+            except Exception as e:
+                self.menu_error = str(e)
+    
+    def _update_sales(self, chunk: pd.DataFrame):
+        dates = pd.to_datetime(chunk[self.date_col], errors='coerce')
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)  # Group on local wall-clock time
+        mask = dates.notna().to_numpy()
+        prices = chunk[self.price_col].to_numpy(dtype=np.float64)[mask]
+        prices = np.where(np.isnan(prices), 0.0, prices)  # Missing prices count as zero, like groupby sums
+        
+        days, day_ids, hours, weekdays = _date_keys(dates.to_numpy()[mask])
+        hourly, hourly_count, weekly, weekly_count, daily = _sales_totals(
+            prices, hours, weekdays, day_ids, len(days))
+        
+        self.hourly_sum += hourly
+        self.hourly_count += hourly_count
+        self.weekday_sum += weekly
+        self.weekday_count += weekly_count
+        for day, total in zip(days, daily):
+            self.daily_sum[day] += total
+    
+    def _update_menu(self, chunk: pd.DataFrame):
+        prices = chunk[self.price_col]
+        if not pd.api.types.is_numeric_dtype(prices):
+            raise TypeError(f"price column '{self.price_col}' is not numeric")
+        self.price_sum += float(prices.sum())
+        self.price_count += int(prices.count())
+        
+        groups = chunk.groupby(self.item_col, sort=False, observed=True)
+        for item, total in groups[self.price_col].sum().items():
+            self.item_sum[item] += total
+        for item, count in groups[self.price_col].count().items():
+            self.item_count[item] += count
+        if self.qty_col is not None and self.qty_col in chunk.columns:
+            for item, qty in groups[self.qty_col].sum().items():
+                self.item_qty[item] += qty
+    
+    def sales_trends(self) -> Dict[str, Any]:
+        """Same result as RestaurantDataAI.analyze_sales_trends, from the running totals"""
+        if self.sales_error is not None:
+            return {"error": f"Analysis failed: {self.sales_error}"}
+        if not self.daily_sum:
+            return {"error": "Analysis failed: no valid dates found"}
+        
+        # Hours and weekdays without orders can't peak
+        hourly_sales = np.where(self.hourly_count > 0, self.hourly_sum, -np.inf)
+        peak_hour = int(hourly_sales.argmax())
+        weekly_sales = np.where(self.weekday_count > 0, self.weekday_sum, -np.inf)
+        best_weekday = int(weekly_sales.argmax())
+        days = sorted(self.daily_sum)
+        
+        return {
+            'daily_average': float(np.mean(list(self.daily_sum.values()))),
+            'peak_hour': peak_hour,
+            'peak_hour_sales': float(hourly_sales[peak_hour]),
+            'best_day': DAY_NAMES[best_weekday],
+            'best_day_average': float(weekly_sales[best_weekday]),
+            'total_revenue': float(self.hourly_sum.sum()),
+            'date_range': {
+                'start': str(days[0]),
+                'end': str(days[-1])
+            }
+        }
+    
+    def menu_performance(self) -> Dict[str, Any]:
+        """Same result as RestaurantDataAI.analyze_menu_performance, from the running totals"""
+        if self.menu_error is not None:
+            return {"error": f"Menu analysis failed: {self.menu_error}"}
+        
+        totals = pd.Series(self.item_sum, dtype=np.float64)
+        counts = pd.Series(self.item_count, dtype=np.int64).reindex(totals.index)
+        item_stats = pd.DataFrame({
+            f'{self.price_col}_sum': totals,
+            f'{self.price_col}_mean': totals / counts.where(counts > 0),
+            f'{self.price_col}_count': counts
+        })
+        if self.item_qty:
+            item_stats[f'{self.qty_col}_sum'] = pd.Series(self.item_qty)
+        
+        # Top performers - items stay in first-seen order, like groupby(sort=False),
+        # and only the reported rows are rounded
+        top_revenue = _top_rows(item_stats, f'{self.price_col}_sum').round(2)
+        top_frequency = _top_rows(item_stats, f'{self.price_col}_count').round(2)
+        
+        return {
+            'top_revenue_items': top_revenue.to_dict('index'),
+            'most_ordered_items': top_frequency.to_dict('index'),
+            'total_unique_items': len(item_stats),
+            'average_item_price': self.price_sum / self.price_count if self.price_count else float('nan')
+        }
 
 class RestaurantDataAI:
     def __init__(self):
@@ -13,29 +395,39 @@ class RestaurantDataAI:
         self.column_mapping = {}
         self.insights = {}
         self.data_type = "unknown"  # transaction, summary, or mixed
+        self._cache = {}  # Analysis results for the currently loaded data
+        self._cache_key = None  # Identity of the data the cached results belong to
+        self._stream = None  # Running totals when the file was streamed
+        
+    def load_data(self, file_path: str, sheet_name: str = None, usecols: List[str] = None,
+                  excel_file: pd.ExcelFile = None) -> bool:
+        """Load and initially process CSV or Excel file (optionally only the given columns)
         
-    def load_data(self, file_path: str, sheet_name: str = None) -> bool:
-        """Load and initially process CSV or Excel file"""
+        An already opened ExcelFile for the same workbook can be passed to skip re-opening it.
+        """
         try:
             # Get file extension
             file_ext = os.path.splitext(file_path.lower())[1]
             
             if file_ext == '.csv':
-                self.data = pd.read_csv(file_path)
+                self.data = self._read_csv(file_path, usecols)
                 print(f"📄 Loaded CSV: {len(self.data)} records from {file_path}")
                 
             elif file_ext in ['.xlsx', '.xls']:
                 # Handle Excel files
                 if sheet_name:
-                    self.data = pd.read_excel(file_path, sheet_name=sheet_name)
+                    self.data = self._read_excel_sheet(file_path, sheet_name, excel_file, usecols)
                     print(f"📊 Loaded Excel sheet '{sheet_name}': {len(self.data)} records from {file_path}")
                 else:
-                    # Load first sheet by default, but show available sheets
-                    excel_file = pd.ExcelFile(file_path)
-                    sheet_names = excel_file.sheet_names
+                    # Load first sheet by default, but show available sheets - listed from the
+                    # workbook index, so a cached first sheet never opens the workbook itself
+                    if excel_file is not None:
+                        sheet_names = excel_file.sheet_names
+                    else:
+                        sheet_names = list_sheet_names(file_path)
                     print(f"📊 Available Excel sheets: {sheet_names}")
                     
-                    self.data = pd.read_excel(file_path, sheet_name=sheet_names[0])
+                    self.data = self._read_excel_sheet(file_path, sheet_names[0], excel_file, usecols)
                     print(f"📊 Loaded Excel sheet '{sheet_names[0]}': {len(self.data)} records from {file_path}")
                     
                     if len(sheet_names) > 1:
@@ -46,7 +438,10 @@ class RestaurantDataAI:
                 print("Supported formats: .csv, .xlsx, .xls")
                 return False
             
+            self._cache.clear()
+            self._stream = None
             self._auto_detect_columns()
+            self._compact_columns()
             self._determine_data_type()
             return True
             
@@ -54,6 +449,95 @@ class RestaurantDataAI:
             print(f"❌ Error loading file: {e}")
             return False
     
+    def load_data_streaming(self, file_path: str, chunksize: int = 200_000) -> bool:
+        """Aggregate a large CSV chunk by chunk instead of loading it into memory
+        
+        Sales and menu analyses read from the running totals; self.data keeps only the
+        first chunk, which column detection and the other analyses work from.
+        """
+        try:
+            aggregator = None
+            # The pyarrow engine can't read in chunks, so this uses the C parser
+            for chunk in pd.read_csv(file_path, chunksize=chunksize, low_memory=False):
+                if aggregator is None:
+                    self.data = chunk
+                    self._cache.clear()
+                    self._auto_detect_columns()
+                    self._determine_data_type()
+                    aggregator = StreamingAggregator(self.column_mapping)
+                aggregator.update(chunk)
+            
+            if aggregator is None:
+                print(f"❌ No records found in {file_path}")
+                return False
+            
+            self._stream = aggregator
+            print(f"📄 Streamed CSV: {aggregator.rows} records from {file_path}")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error loading file: {e}")
+            return False
+    
+    def _read_csv(self, file_path: str, usecols: List[str] = None) -> pd.DataFrame:
+        """Read a CSV, reusing a Parquet copy cached by an earlier run"""
+        return self._read_cached(file_path, None, self._parse_csv, usecols)
+    
+    def _parse_csv(self, file_path: str, usecols: List[str] = None) -> pd.DataFrame:
+        """Parse a CSV with the fastest available engine"""
+        if CSV_ENGINE == "pyarrow":
+            try:
+                df = pd.read_csv(file_path, usecols=usecols, engine="pyarrow")
+                # pyarrow infers second-precision timestamps, which Parquet can't store;
+                # use nanoseconds like the C parser so cached and fresh loads match
+                for col, dtype in df.dtypes.items():
+                    if isinstance(dtype, np.dtype) and dtype.kind == 'M' and dtype != 'datetime64[ns]':
+                        df[col] = df[col].astype('datetime64[ns]')
+                return df
+            except Exception:
+                pass  # pyarrow rejects some malformed files the C parser copes with
+        return pd.read_csv(file_path, usecols=usecols, engine="c", low_memory=False)
+    
+    def _read_excel_sheet(self, file_path: str, sheet_name: str, excel_file=None,
+                          usecols: List[str] = None) -> pd.DataFrame:
+        """Read an Excel sheet, reusing a Parquet copy cached by an earlier run"""
+        def parse(path, usecols):
+            return pd.read_excel(excel_file or path, sheet_name=sheet_name,
+                                 usecols=usecols, engine=EXCEL_ENGINE)
+        return self._read_cached(file_path, sheet_name, parse, usecols)
+    
+    def _read_cached(self, file_path: str, sheet_name: str, parse, usecols: List[str] = None) -> pd.DataFrame:
+        """Return parse(file_path, usecols), cached as a Parquet file in PARQUET_CACHE_DIR
+        
+        Each file (and sheet) gets its own name prefix from a hash of its path, and the
+        copy is keyed on the file's mtime in nanoseconds and size, so replaced files are re-parsed.
+        """
+        if not PARQUET_CACHE:
+            return parse(file_path, usecols)
+        
+        source = repr((os.path.abspath(file_path), sheet_name)).encode('utf-8', 'surrogatepass')
+        prefix = hashlib.sha1(source).hexdigest()
+        stat = os.stat(file_path)
+        cache_file = os.path.join(PARQUET_CACHE_DIR, f"{prefix}.{stat.st_mtime_ns}.{stat.st_size}.parquet")
+        if os.path.exists(cache_file):
+            # Parquet is columnar, so a column subset only decodes those columns
+            return pd.read_parquet(cache_file, columns=usecols)
+        
+        df = parse(file_path, usecols)
+        if usecols is not None:
+            return df  # Only full tables are cached
+        
+        try:
+            os.makedirs(PARQUET_CACHE_DIR, exist_ok=True)
+            stale = re.compile(re.escape(prefix) + r"\.\d+\.\d+\.parquet")
+            for entry in os.scandir(PARQUET_CACHE_DIR):
+                if stale.fullmatch(entry.name):
+                    os.remove(entry.path)
+            df.to_parquet(cache_file, compression="zstd")
+        except Exception:
+            pass  # Caching is best effort (e.g. mixed-type columns Parquet can't store)
+        return df
+    
     # Keep the old method for backward compatibility
     def load_csv(self, file_path: str) -> bool:
         """Legacy method - use load_data() instead"""
@@ -85,31 +569,46 @@ class RestaurantDataAI:
     
     def _auto_detect_columns(self):
         """Enhanced AI-powered column detection for restaurant data"""
+        # Toast exports repeat the same schemas across sheets and files, so detection is memoized
         columns = self.data.columns.str.lower()
-        
-        # Enhanced patterns with more variations
-        patterns = {
-            'date': ['date', 'time', 'created', 'order_date', 'timestamp', 'day', 'week', 'month'],
-            'item_name': ['item', 'product', 'menu', 'name', 'description', 'dish'],
-            'price': ['price', 'amount', 'total', 'cost', 'revenue', 'sales', 'value'],
-            'quantity': ['qty', 'quantity', 'count', 'units', 'orders', 'sold'],
-            'category': ['category', 'type', 'group', 'section', 'department'],
-            'payment': ['payment', 'method', 'card', 'cash', 'tender'],
-            'employee': ['employee', 'staff', 'server', 'cashier', 'waiter'],
-            'order_id': ['order', 'ticket', 'transaction', 'receipt', 'id'],
-            'customer': ['customer', 'guest', 'phone', 'email', 'patron']
-        }
-        
-        for data_type, keywords in patterns.items():
-            for col in columns:
-                if any(keyword in col for keyword in keywords):
-                    self.column_mapping[data_type] = self.data.columns[columns.get_loc(col)]
-                    break
+        self.column_mapping.update(self._detect_for(tuple(self.data.columns), tuple(columns)))
         
         print("Detected columns:")
         for key, value in self.column_mapping.items():
             print(f"  {key}: {value}")
     
+    def _compact_columns(self):
+        """Shrink the detected key columns: small integer dtypes for counts, category for text labels"""
+        for data_type in ('price', 'quantity'):
+            col = self.column_mapping.get(data_type)
+            if col not in self.data.columns:
+                continue
+            # Floats stay float64 - float32 prices shift reported averages and totals by a cent
+            if pd.api.types.is_integer_dtype(self.data[col]):
+                self.data[col] = pd.to_numeric(self.data[col], downcast='integer')
+        
+        # Repeated labels become integer codes, so groupbys hash ints instead of Python strings.
+        # Mostly-unique columns (customer IDs) stay text - one category per row would be larger
+        for data_type in ('item_name', 'category', 'payment', 'employee', 'customer'):
+            col = self.column_mapping.get(data_type)
+            if col in self.data.columns and self.data[col].dtype == 'object':
+                if self.data[col].nunique() < CATEGORY_RATIO * len(self.data):
+                    self.data[col] = self.data[col].astype('category')
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _detect_for(column_names: Tuple, columns: Tuple[str, ...]) -> Tuple[Tuple[str, Any], ...]:
+        """Match lowercased column names against the known patterns (cached per schema, shared by all instances)"""
+        # One precompiled alternation per data type instead of a substring test per keyword
+        mapping = []
+        for data_type, pattern in COLUMN_PATTERNS.items():
+            for i, col in enumerate(columns):
+                if pattern.search(col):
+                    mapping.append((data_type, column_names[i]))
+                    break
+        return tuple(mapping)
+    
+    @_cached('quality')
     def analyze_data_quality(self) -> Dict[str, Any]:
         """Analyze data quality and provide insights"""
         if self.data is None:
@@ -119,8 +618,9 @@ class RestaurantDataAI:
             total_rows = len(self.data)
             total_cols = len(self.data.columns)
             
-            # Missing data analysis
-            missing_data = self.data.isnull().sum()
+            # Missing data analysis - per-column non-null counts, without building an N x C null mask
+            missing_data = total_rows - self.data.count()
+            missing_total = int(missing_data.sum())
             missing_percentage = (missing_data / total_rows * 100).round(2)
             
             # Duplicate analysis
@@ -139,10 +639,10 @@ class RestaurantDataAI:
                 quality_score -= min(20, duplicates / total_rows * 100)
                 issues.append(f"{duplicates} duplicate records found")
                 
-            if missing_data.sum() > 0:
-                missing_ratio = missing_data.sum() / (total_rows * total_cols)
+            if missing_total > 0:
+                missing_ratio = missing_total / (total_rows * total_cols)
                 quality_score -= min(30, missing_ratio * 100)
-                issues.append(f"{missing_data.sum()} missing values across dataset")
+                issues.append(f"{missing_total} missing values across dataset")
             
             return {
                 'total_records': total_rows,
@@ -158,6 +658,7 @@ class RestaurantDataAI:
         except Exception as e:
             return {"error": f"Data quality analysis failed: {e}"}
     
+    @_cached('summary')
     def analyze_summary_data(self) -> Dict[str, Any]:
         """Analyze summary-style data (daily/weekly totals)"""
         if self.data is None:
@@ -171,21 +672,42 @@ class RestaurantDataAI:
                 return {"error": "No numeric columns found for analysis"}
             
             for col in numeric_cols:
-                col_data = self.data[col].dropna()
-                if len(col_data) > 0:
+                values = self.data[col].dropna().to_numpy(dtype=np.float64)
+                if values.size > 0:
+                    total = values.sum()
+                    average, maximum, minimum, std, first_half, second_half = _column_stats(values, total)
                     results[col] = {
-                        'total': float(col_data.sum()),
-                        'average': float(col_data.mean()),
-                        'max': float(col_data.max()),
-                        'min': float(col_data.min()),
-                        'std': float(col_data.std()) if len(col_data) > 1 else 0,
-                        'trend': self._calculate_trend(col_data)
+                        'total': float(total),
+                        'average': float(average),
+                        'max': float(maximum),
+                        'min': float(minimum),
+                        'std': float(std) if values.size > 1 else 0,
+                        'trend': _trend_label(first_half, second_half) if values.size > 1 else "insufficient_data"
                     }
             
             return results
         except Exception as e:
             return {"error": f"Summary analysis failed: {e}"}
     
+    @_cached('summary_roles')
+    def _summary_roles(self) -> Dict[str, List[str]]:
+        """Summary columns holding revenue, customer and guest figures, in column order"""
+        roles = {'revenue': [], 'customer': [], 'guest': []}
+        summary_data = self.analyze_summary_data()
+        if _failed(summary_data):
+            return roles
+        
+        for col_name in summary_data:
+            name = col_name.lower()
+            if 'sales' in name or 'revenue' in name:
+                roles['revenue'].append(col_name)
+            if 'guest' in name or 'customer' in name:
+                roles['customer'].append(col_name)
+            if 'guest' in name:
+                roles['guest'].append(col_name)
+        return roles
+    
+    @_cached('opportunities')
     def analyze_business_opportunities(self) -> Dict[str, Any]:
         """Identify specific business opportunities and growth areas"""
         opportunities = []
@@ -195,45 +717,47 @@ class RestaurantDataAI:
             
         try:
             summary_data = self.analyze_summary_data()
-            if 'error' not in summary_data:
+            if not _failed(summary_data):
+                roles = self._summary_roles()
+                
                 # Revenue optimization opportunities
-                for col_name, stats in summary_data.items():
-                    if 'sales' in col_name.lower() or 'revenue' in col_name.lower():
-                        if stats['trend'] == 'decreasing':
-                            opportunities.append({
-                                'type': 'revenue_recovery',
-                                'priority': 'HIGH',
-                                'issue': f'{col_name} is declining',
-                                'impact': stats['total'],
-                                'recommendation': 'Implement immediate revenue recovery strategies'
-                            })
-                        elif stats['trend'] == 'stable' and stats['std'] < stats['average'] * 0.1:
-                            opportunities.append({
-                                'type': 'growth_potential',
-                                'priority': 'MEDIUM',
-                                'issue': f'{col_name} has low variation - untapped potential',
-                                'impact': stats['total'] * 0.15,  # Potential 15% increase
-                                'recommendation': 'Focus on growth initiatives'
-                            })
+                for col_name in roles['revenue']:
+                    stats = summary_data[col_name]
+                    if stats['trend'] == 'decreasing':
+                        opportunities.append({
+                            'type': 'revenue_recovery',
+                            'priority': 'HIGH',
+                            'issue': f'{col_name} is declining',
+                            'impact': stats['total'],
+                            'recommendation': 'Implement immediate revenue recovery strategies'
+                        })
+                    elif stats['trend'] == 'stable' and stats['std'] < stats['average'] * 0.1:
+                        opportunities.append({
+                            'type': 'growth_potential',
+                            'priority': 'MEDIUM',
+                            'issue': f'{col_name} has low variation - untapped potential',
+                            'impact': stats['total'] * 0.15,  # Potential 15% increase
+                            'recommendation': 'Focus on growth initiatives'
+                        })
                 
                 # Customer frequency opportunities
-                for col_name, stats in summary_data.items():
-                    if 'guest' in col_name.lower() or 'customer' in col_name.lower():
-                        avg_daily = stats['average']
-                        if avg_daily < 200:  # Low traffic threshold
-                            opportunities.append({
-                                'type': 'customer_acquisition',
-                                'priority': 'HIGH',
-                                'issue': f'Low customer volume ({avg_daily:.0f}/day)',
-                                'impact': (250 - avg_daily) * 7 * 4,  # Monthly impact
-                                'recommendation': 'Launch customer acquisition campaigns'
-                            })
+                for col_name in roles['customer']:
+                    avg_daily = summary_data[col_name]['average']
+                    if avg_daily < 200:  # Low traffic threshold
+                        opportunities.append({
+                            'type': 'customer_acquisition',
+                            'priority': 'HIGH',
+                            'issue': f'Low customer volume ({avg_daily:.0f}/day)',
+                            'impact': (250 - avg_daily) * 7 * 4,  # Monthly impact
+                            'recommendation': 'Launch customer acquisition campaigns'
+                        })
             
             return {'opportunities': opportunities}
             
         except Exception as e:
             return {"error": f"Business opportunity analysis failed: {e}"}
     
+    @_cached('recommendations')
     def generate_strategic_recommendations(self) -> Dict[str, List[str]]:
         """Generate specific, actionable business recommendations"""
         recommendations = {
@@ -251,9 +775,10 @@ class RestaurantDataAI:
             summary_data = self.analyze_summary_data()
             opportunities = self.analyze_business_opportunities()
             quality_data = self.analyze_data_quality()
+            roles = self._summary_roles()
             
             # Immediate Actions (0-30 days)
-            if 'error' not in summary_data:
+            if not _failed(summary_data):
                 declining_metrics = []
                 stable_metrics = []
                 
@@ -272,65 +797,36 @@ class RestaurantDataAI:
                     )
                 
                 # Check for low customer counts
-                for col_name, stats in summary_data.items():
-                    if 'guest' in col_name.lower() and stats['average'] < 150:
+                for col_name in roles['guest']:
+                    if summary_data[col_name]['average'] < 150:
                         recommendations['immediate_actions'].append(
                             "🎯 Launch flash promotion this week - customer count below optimal threshold"
                         )
             
             # Marketing Strategies (1-3 months)
-            customer_metrics = []
-            revenue_metrics = []
-            
-            if 'error' not in summary_data:
-                for col_name, stats in summary_data.items():
-                    if 'guest' in col_name.lower() or 'customer' in col_name.lower():
-                        customer_metrics.append(stats['average'])
-                    elif 'sales' in col_name.lower() or 'revenue' in col_name.lower():
-                        revenue_metrics.append(stats['average'])
+            customer_metrics = [summary_data[col_name]['average'] for col_name in roles['customer']]
             
             if customer_metrics and customer_metrics[0] < 200:
-                recommendations['marketing_strategies'].extend([
-                    "📱 Implement social media advertising campaign - target 25% customer increase",
-                    "🎁 Create loyalty program to increase repeat visits by 30%",
-                    "📧 Launch email marketing to inactive customers from your POS database"
-                ])
+                recommendations['marketing_strategies'].extend(GROWTH_MARKETING)
             elif customer_metrics and customer_metrics[0] > 300:
-                recommendations['marketing_strategies'].extend([
-                    "⭐ Focus on premium offerings - you have strong customer base",
-                    "📈 Upselling training for staff to increase average ticket size",
-                    "🏆 Implement VIP program for high-value customers"
-                ])
+                recommendations['marketing_strategies'].extend(PREMIUM_MARKETING)
             
             # Operational Improvements
             if len(self.data) >= 7:  # Weekly data available
-                recommendations['operational_improvements'].extend([
-                    "📅 Analyze daily patterns to optimize staff scheduling",
-                    "🍽️ Review menu performance - identify low-performing items to remove",
-                    "⏰ Implement peak-hour operational efficiency improvements"
-                ])
+                recommendations['operational_improvements'].extend(WEEKLY_OPERATIONS)
             
             # Revenue Optimization
-            if 'error' not in summary_data:
-                total_revenue = sum(stats['total'] for col_name, stats in summary_data.items() 
-                                 if 'sales' in col_name.lower() or 'revenue' in col_name.lower())
+            if not _failed(summary_data):
+                total_revenue = sum(summary_data[col_name]['total'] for col_name in roles['revenue'])
                 
                 if total_revenue > 0:
-                    recommendations['revenue_optimization'].extend([
-                        f"💰 Target 15% revenue increase = ${total_revenue * 0.15:,.0f} monthly potential",
-                        "🎯 Focus on high-margin items - conduct menu engineering analysis",
-                        "💳 Optimize payment processing - reduce transaction times by 20%",
-                        "🥤 Implement strategic upselling - beverages and appetizers"
-                    ])
+                    recommendations['revenue_optimization'].append(
+                        f"💰 Target 15% revenue increase = ${total_revenue * 0.15:,.0f} monthly potential"
+                    )
+                    recommendations['revenue_optimization'].extend(REVENUE_TACTICS)
             
             # Long-term Strategy (3-12 months)
-            recommendations['long_term_strategy'].extend([
-                "📊 Implement advanced POS analytics for real-time decision making",
-                "🏪 Consider expansion opportunities based on current performance trends",
-                "🤖 Automate inventory management to reduce waste by 10-15%",
-                "👥 Develop staff performance incentives tied to customer satisfaction",
-                "📈 Create quarterly business reviews using data-driven insights"
-            ])
+            recommendations['long_term_strategy'].extend(LONG_TERM_STRATEGY)
             
             # Data quality recommendations
             if quality_data.get('quality_score', 100) < 90:
@@ -343,6 +839,7 @@ class RestaurantDataAI:
         except Exception as e:
             return {"error": f"Strategic recommendation generation failed: {e}"}
     
+    @_cached('revenue_impact')
     def calculate_revenue_impact(self) -> Dict[str, Any]:
         """Calculate potential revenue impact of recommendations"""
         if self.data is None:
@@ -352,41 +849,20 @@ class RestaurantDataAI:
             summary_data = self.analyze_summary_data()
             impact_analysis = {}
             
-            if 'error' not in summary_data:
+            if not _failed(summary_data):
                 # Calculate baseline metrics
-                total_revenue = 0
-                total_customers = 0
-                
-                for col_name, stats in summary_data.items():
-                    if 'sales' in col_name.lower() or 'revenue' in col_name.lower():
-                        total_revenue = stats['total']
-                    elif 'guest' in col_name.lower() or 'customer' in col_name.lower():
-                        total_customers = stats['total']
+                revenue_cols = self._summary_roles()['revenue']
+                total_revenue = summary_data[revenue_cols[-1]]['total'] if revenue_cols else 0
                 
                 if total_revenue > 0:
                     # Conservative improvement estimates
-                    impact_analysis = {
-                        'customer_acquisition_25%': {
-                            'monthly_impact': total_revenue * 0.25,
-                            'annual_impact': total_revenue * 0.25 * 12,
-                            'strategy': 'Marketing campaigns and promotions'
-                        },
-                        'average_ticket_15%': {
-                            'monthly_impact': total_revenue * 0.15,
-                            'annual_impact': total_revenue * 0.15 * 12,
-                            'strategy': 'Upselling and menu optimization'
-                        },
-                        'operational_efficiency_10%': {
-                            'monthly_impact': total_revenue * 0.10,
-                            'annual_impact': total_revenue * 0.10 * 12,
-                            'strategy': 'Improved processes and waste reduction'
-                        },
-                        'combined_impact': {
-                            'monthly_impact': total_revenue * 0.50,  # Combined effect
-                            'annual_impact': total_revenue * 0.50 * 12,
-                            'strategy': 'All recommendations implemented'
+                    for name, share, strategy in IMPACT_STRATEGIES:
+                        monthly_impact = total_revenue * share
+                        impact_analysis[name] = {
+                            'monthly_impact': monthly_impact,
+                            'annual_impact': monthly_impact * 12,
+                            'strategy': strategy
                         }
-                    }
             
             return impact_analysis
             
@@ -394,78 +870,89 @@ class RestaurantDataAI:
             return {"error": f"Revenue impact calculation failed: {e}"}
     
     def _calculate_trend(self, data_series) -> str:
-        """Calculate if data is trending up, down, or stable"""
-        if len(data_series) < 2:
+        """Calculate if data is trending up, down, or stable (from a Series or array)"""
+        values = np.asarray(data_series, dtype=np.float64)
+        if values.size < 2:
             return "insufficient_data"
             
-        # Simple trend calculation
-        first_half = data_series[:len(data_series)//2].mean()
-        second_half = data_series[len(data_series)//2:].mean()
-        
-        change_percent = ((second_half - first_half) / first_half * 100) if first_half != 0 else 0
+        # Simple trend calculation - plain array slices, no pandas dispatch per half
+        half = values.size // 2
+        return _trend_label(values[:half].mean(), values[half:].mean())
+    
+    def generate_advanced_insights(self, revenue_impact: Dict[str, Any] = None,
+                                   recommendations: Dict[str, List[str]] = None,
+                                   quality_data: Dict[str, Any] = None,
+                                   summary_data: Dict[str, Any] = None) -> List[str]:
+        """Generate beautifully formatted, professional insights with business recommendations
         
-        if change_percent > 5:
-            return "increasing"
-        elif change_percent < -5:
-            return "decreasing"
-        else:
-            return "stable"
+        Results the caller has already computed can be passed in instead of being recomputed.
+        """
+        return list(self.iter_advanced_insights(revenue_impact, recommendations, quality_data, summary_data))
     
-    def generate_advanced_insights(self) -> List[str]:
-        """Generate beautifully formatted, professional insights with business recommendations"""
-        insights = []
+    def iter_advanced_insights(self, revenue_impact: Dict[str, Any] = None,
+                               recommendations: Dict[str, List[str]] = None,
+                               quality_data: Dict[str, Any] = None,
+                               summary_data: Dict[str, Any] = None):
+        """Yield the insights report line by line
         
+        Each analysis runs only once the first section that needs it is reached, so a caller
+        that stops early skips the work behind the sections it never reads.
+        """
         if self.data is None:
-            return ["❌ No data loaded for analysis"]
+            yield "❌ No data loaded for analysis"
+            return
         
         # Header Section
-        insights.append("═══ 🎯 BUSINESS STRATEGY & INTELLIGENCE REPORT ═══")
-        insights.append("")
+        yield from REPORT_HEADER
         
         # Executive Summary with Revenue Impact
-        revenue_impact = self.calculate_revenue_impact()
-        if 'error' not in revenue_impact and revenue_impact:
-            insights.append("💰 EXECUTIVE SUMMARY - REVENUE OPPORTUNITIES")
-            insights.append("─" * 50)
-            
-            if 'combined_impact' in revenue_impact:
-                monthly_potential = revenue_impact['combined_impact']['monthly_impact']
-                annual_potential = revenue_impact['combined_impact']['annual_impact']
-                insights.append(f"🚀 TOTAL GROWTH POTENTIAL: ${monthly_potential:,.0f}/month | ${annual_potential:,.0f}/year")
-                insights.append("")
+        if revenue_impact is None:
+            revenue_impact = self.calculate_revenue_impact()
+        yield from self._section_executive_summary(revenue_impact)
         
         # Strategic Recommendations Section - THE MAIN EVENT
-        recommendations = self.generate_strategic_recommendations()
-        if 'error' not in recommendations:
-            insights.append("🎯 IMMEDIATE ACTION PLAN (Next 30 Days)")
-            insights.append("─" * 50)
-            for i, action in enumerate(recommendations.get('immediate_actions', []), 1):
-                insights.append(f"{i}. {action}")
-            insights.append("")
-            
-            insights.append("📈 MARKETING & GROWTH STRATEGIES (1-3 Months)")
-            insights.append("─" * 50)
-            for i, strategy in enumerate(recommendations.get('marketing_strategies', []), 1):
-                insights.append(f"{i}. {strategy}")
-            insights.append("")
-            
-            insights.append("⚙️ OPERATIONAL IMPROVEMENTS")
-            insights.append("─" * 50)
-            for i, improvement in enumerate(recommendations.get('operational_improvements', []), 1):
-                insights.append(f"{i}. {improvement}")
-            insights.append("")
-            
-            insights.append("💰 REVENUE OPTIMIZATION TACTICS")
-            insights.append("─" * 50)
-            for i, tactic in enumerate(recommendations.get('revenue_optimization', []), 1):
-                insights.append(f"{i}. {tactic}")
-            insights.append("")
+        if recommendations is None:
+            recommendations = self.generate_strategic_recommendations()
+        yield from self._section_action_plan(recommendations)
         
         # Data Quality Section (Condensed)
-        quality_data = self.analyze_data_quality()
-        if 'error' not in quality_data:
-            insights.append("📊 DATA QUALITY & PERFORMANCE METRICS")
-            insights.append("─" * 50)
+        if quality_data is None:
+            quality_data = self.analyze_data_quality()
+        yield from self._section_data_quality(quality_data)
+        
+        # Performance Metrics Section (Condensed but insightful)
+        if self.data_type == "summary":
+            if summary_data is None:
+                summary_data = self.analyze_summary_data()
+            yield from self._section_performance(summary_data)
+        
+        yield from self._section_financial_impact(revenue_impact)
+        yield from self._section_long_term(recommendations)
+        yield from self._section_next_steps()
+    
+    def _section_executive_summary(self, revenue_impact: Dict[str, Any]):
+        """Headline growth potential"""
+        if not _failed(revenue_impact) and revenue_impact:
+            yield from ("💰 EXECUTIVE SUMMARY - REVENUE OPPORTUNITIES", REPORT_RULE)
+            
+            if 'combined_impact' in revenue_impact:
+                monthly_potential = revenue_impact['combined_impact']['monthly_impact']
+                annual_potential = revenue_impact['combined_impact']['annual_impact']
+                yield f"🚀 TOTAL GROWTH POTENTIAL: ${monthly_potential:,.0f}/month | ${annual_potential:,.0f}/year"
+                yield ""
+    
+    def _section_action_plan(self, recommendations: Dict[str, List[str]]):
+        """Immediate, marketing, operational and revenue recommendations"""
+        if not _failed(recommendations):
+            for title, key in ACTION_PLAN_SECTIONS:
+                yield from (title, REPORT_RULE)
+                yield from (f"{i}. {item}" for i, item in enumerate(recommendations.get(key, []), 1))
+                yield ""
+    
+    def _section_data_quality(self, quality_data: Dict[str, Any]):
+        """Data quality score with a status label"""
+        if not _failed(quality_data):
+            yield from ("📊 DATA QUALITY & PERFORMANCE METRICS", REPORT_RULE)
             
             score = quality_data['quality_score']
             if score >= 95:
@@ -478,59 +965,62 @@ class RestaurantDataAI:
                 status_emoji = "🔴"
                 status_text = "NEEDS IMPROVEMENT"
                 
-            insights.append(f"{status_emoji} Data Quality: {score}/100 - {status_text}")
-        
-        # Performance Metrics Section (Condensed but insightful)
-        if self.data_type == "summary":
-            summary_data = self.analyze_summary_data()
-            if 'error' not in summary_data:
-                # Sort metrics by total value for better presentation
-                sorted_metrics = sorted(summary_data.items(), key=lambda x: x[1]['total'], reverse=True)
+            yield f"{status_emoji} Data Quality: {score}/100 - {status_text}"
+    
+    def _section_performance(self, summary_data: Dict[str, Any]):
+        """Top three summary metrics and their trends"""
+        if not _failed(summary_data):
+            # Top 3 metrics by total value - same order as a full descending sort
+            top_metrics = heapq.nlargest(3, summary_data.items(), key=lambda x: x[1]['total'])
+            
+            for i, (col_name, stats) in enumerate(top_metrics):
+                display_name = col_name.replace('_', ' ').title()
+                yield f"{i+1}. {display_name}: ${stats['total']:,.0f} total | ${stats['average']:,.0f} avg"
                 
-                for i, (col_name, stats) in enumerate(sorted_metrics[:3]):  # Top 3 metrics only
-                    display_name = col_name.replace('_', ' ').title()
-                    insights.append(f"{i+1}. {display_name}: ${stats['total']:,.0f} total | ${stats['average']:,.0f} avg")
-                    
-                    if stats['trend'] == 'increasing':
-                        insights.append("   📈 TRENDING UP - Maintain momentum!")
-                    elif stats['trend'] == 'decreasing':
-                        insights.append("   📉 NEEDS ATTENTION - See action plan above")
-                    else:
-                        insights.append("   ➡️  STABLE - Growth opportunity available")
-            insights.append("")
-        
-        # Financial Impact Projections
-        if 'error' not in revenue_impact and revenue_impact:
-            insights.append("💎 PROJECTED FINANCIAL IMPACT")
-            insights.append("─" * 50)
+                if stats['trend'] == 'increasing':
+                    yield "   📈 TRENDING UP - Maintain momentum!"
+                elif stats['trend'] == 'decreasing':
+                    yield "   📉 NEEDS ATTENTION - See action plan above"
+                else:
+                    yield "   ➡️  STABLE - Growth opportunity available"
+        yield ""
+    
+    def _section_financial_impact(self, revenue_impact: Dict[str, Any]):
+        """Monthly impact of each improvement strategy"""
+        if not _failed(revenue_impact) and revenue_impact:
+            yield from ("💎 PROJECTED FINANCIAL IMPACT", REPORT_RULE)
             
             for strategy_name, impact_data in revenue_impact.items():
                 if strategy_name != 'combined_impact':
-                    strategy_display = strategy_name.replace('_', ' ').title()
+                    strategy_display = IMPACT_LABELS.get(strategy_name) or strategy_name.replace('_', ' ').title()
                     monthly = impact_data['monthly_impact']
-                    insights.append(f"• {strategy_display}: +${monthly:,.0f}/month")
-            insights.append("")
-        
-        # Long-term Strategy
-        if recommendations.get('long_term_strategy'):
-            insights.append("🚀 LONG-TERM GROWTH STRATEGY (3-12 Months)")
-            insights.append("─" * 50)
-            for i, strategy in enumerate(recommendations['long_term_strategy'][:3], 1):  # Top 3
-                insights.append(f"{i}. {strategy}")
-            insights.append("")
-        
-        # Call to Action
-        insights.append("✅ NEXT STEPS")
-        insights.append("─" * 50)
-        insights.append("1. 📋 Review and prioritize the immediate action items above")
-        insights.append("2. 🎯 Select 2-3 marketing strategies to implement this month") 
-        insights.append("3. 💰 Track progress weekly and adjust strategies based on results")
-        insights.append("4. 📊 Schedule monthly data reviews to monitor improvement")
-        insights.append("")
-        insights.append("═══ 📈 YOUR BUSINESS SUCCESS ROADMAP IS READY! ═══")
-        
-        return insights
+                    yield f"• {strategy_display}: +${monthly:,.0f}/month"
+            yield ""
     
+    def _section_long_term(self, recommendations: Dict[str, List[str]]):
+        """Top three long-term strategies"""
+        long_term = recommendations.get('long_term_strategy')
+        if long_term:
+            yield from ("🚀 LONG-TERM GROWTH STRATEGY (3-12 Months)", REPORT_RULE)
+            top_strategies = long_term[:3]  # Top 3
+            yield from (f"{i}. {strategy}" for i, strategy in enumerate(top_strategies, 1))
+            yield ""
+    
+    def _section_next_steps(self):
+        """Closing call to action"""
+        yield from NEXT_STEPS
+    
+    @_cached('dates')
+    def _parsed_dates(self) -> pd.Series:
+        """The detected date column parsed to datetimes, once per load"""
+        dates = self.data[self.column_mapping['date']]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, errors='coerce')  # Already-typed columns skip parsing
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)  # Group on local wall-clock time
+        return dates
+    
+    @_cached('sales')
     def analyze_sales_trends(self) -> Dict[str, Any]:
         """Analyze temporal sales patterns - optimized for data type"""
         # For summary data, skip this analysis gracefully
@@ -540,41 +1030,52 @@ class RestaurantDataAI:
         if 'date' not in self.column_mapping or 'price' not in self.column_mapping:
             return {"skipped": "Missing required columns for sales analysis", "type": "missing_columns"}
         
+        if self._stream is not None:
+            return self._stream.sales_trends()
+        
         try:
             # Convert date column to datetime
             date_col = self.column_mapping['date']
             price_col = self.column_mapping['price']
             
-            df = self.data.copy()
-            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-            df = df.dropna(subset=[date_col])
+            # Work on the two columns directly instead of copying the whole frame
+            dates = self._parsed_dates()
+            mask = dates.notna().to_numpy()
+            if not mask.any():
+                return {"error": "Analysis failed: no valid dates found"}
+            # Filter just the two arrays in use, rather than dropping rows from a frame
+            prices = self.data[price_col].to_numpy(dtype=np.float64)[mask]
+            prices = np.where(np.isnan(prices), 0.0, prices)  # Missing prices count as zero, like groupby sums
             
-            # Daily sales trends
-            daily_sales = df.groupby(df[date_col].dt.date)[price_col].sum()
+            # Daily, hourly and weekly totals in one pass over small integer keys
+            days, day_ids, hours, weekdays = _date_keys(dates.to_numpy()[mask])
+            hourly_sales, hourly_count, weekly_sales, weekly_count, daily_sales = _sales_totals(
+                prices, hours, weekdays, day_ids, len(days))
             
             # Hourly patterns
-            hourly_sales = df.groupby(df[date_col].dt.hour)[price_col].sum()
-            peak_hour = hourly_sales.idxmax()
+            hourly_sales[hourly_count == 0] = -np.inf  # Hours without orders can't peak
+            peak_hour = int(hourly_sales.argmax())
             
             # Weekly patterns  
-            weekly_sales = df.groupby(df[date_col].dt.day_name())[price_col].sum()
-            best_day = weekly_sales.idxmax()
+            weekly_sales[weekly_count == 0] = -np.inf
+            best_weekday = int(weekly_sales.argmax())
             
             return {
                 'daily_average': float(daily_sales.mean()),
-                'peak_hour': int(peak_hour),
+                'peak_hour': peak_hour,
                 'peak_hour_sales': float(hourly_sales[peak_hour]),
-                'best_day': best_day,
-                'best_day_average': float(weekly_sales[best_day]),
-                'total_revenue': float(df[price_col].sum()),
+                'best_day': DAY_NAMES[best_weekday],
+                'best_day_average': float(weekly_sales[best_weekday]),
+                'total_revenue': float(prices.sum()),
                 'date_range': {
-                    'start': str(daily_sales.index.min()),
-                    'end': str(daily_sales.index.max())
+                    'start': str(days[0]),
+                    'end': str(days[-1])
                 }
             }
         except Exception as e:
             return {"error": f"Analysis failed: {e}"}
     
+    @_cached('menu')
     def analyze_menu_performance(self) -> Dict[str, Any]:
         """Analyze which menu items are performing best/worst - optimized for data type"""
         # For summary data, skip this analysis gracefully
@@ -584,30 +1085,31 @@ class RestaurantDataAI:
         if 'item_name' not in self.column_mapping or 'price' not in self.column_mapping:
             return {"skipped": "Missing required columns for menu analysis", "type": "missing_columns"}
         
+        if self._stream is not None:
+            return self._stream.menu_performance()
+        
         try:
             item_col = self.column_mapping['item_name']
             price_col = self.column_mapping['price']
             qty_col = self.column_mapping.get('quantity', None)
             
-            df = self.data.copy()
+            df = self.data  # Only read from, so no copy is needed
             
-            # Group by item
+            # Group by item - named aggregations give flat column names directly
+            aggregations = {
+                f'{price_col}_sum': (price_col, 'sum'),
+                f'{price_col}_mean': (price_col, 'mean'),
+                f'{price_col}_count': (price_col, 'count')
+            }
             if qty_col and qty_col in df.columns:
-                item_stats = df.groupby(item_col).agg({
-                    price_col: ['sum', 'mean', 'count'],
-                    qty_col: 'sum'
-                }).round(2)
-            else:
-                item_stats = df.groupby(item_col).agg({
-                    price_col: ['sum', 'mean', 'count']
-                }).round(2)
+                aggregations[f'{qty_col}_sum'] = (qty_col, 'sum')
             
-            # Flatten column names
-            item_stats.columns = ['_'.join(col).strip() for col in item_stats.columns]
+            # Only the top items are reported, so the groups don't need sorting
+            item_stats = df.groupby(item_col, sort=False, observed=True).agg(**aggregations)
             
-            # Top performers
-            top_revenue = item_stats.nlargest(5, f'{price_col}_sum')
-            top_frequency = item_stats.nlargest(5, f'{price_col}_count')
+            # Top performers - only the reported rows are rounded
+            top_revenue = _top_rows(item_stats, f'{price_col}_sum').round(2)
+            top_frequency = _top_rows(item_stats, f'{price_col}_count').round(2)
             
             return {
                 'top_revenue_items': top_revenue.to_dict('index'),
@@ -618,23 +1120,36 @@ class RestaurantDataAI:
         except Exception as e:
             return {"error": f"Menu analysis failed: {e}"}
     
-    def generate_ai_insights(self) -> List[str]:
+    def generate_ai_insights(self, **precomputed) -> List[str]:
         """Main insights method - now uses the advanced version"""
-        return self.generate_advanced_insights()
+        return self.generate_advanced_insights(**precomputed)
     
     def export_analysis(self, output_file: str = "analysis_results.json"):
         """Export all analysis results including business recommendations to JSON for C++ frontend"""
+        # Compute each section once and hand the shared ones to the insights report
+        quality_data = self.analyze_data_quality()
+        summary_data = self.analyze_summary_data()
+        recommendations = self.generate_strategic_recommendations()
+        revenue_impact = self.calculate_revenue_impact()
+        is_summary = self.data_type == "summary"
+        
         results = {
             'column_mapping': self.column_mapping,
             'data_type': self.data_type,
-            'data_quality': self.analyze_data_quality(),
-            'summary_analysis': self.analyze_summary_data(),
+            'data_quality': quality_data,
+            'summary_analysis': summary_data,
             'business_opportunities': self.analyze_business_opportunities(),
-            'strategic_recommendations': self.generate_strategic_recommendations(),
-            'revenue_impact_projections': self.calculate_revenue_impact(),
-            'sales_trends': self.analyze_sales_trends(),
-            'menu_performance': self.analyze_menu_performance(),
-            'ai_insights': self.generate_ai_insights(),
+            'strategic_recommendations': recommendations,
+            'revenue_impact_projections': revenue_impact,
+            # Summary sheets have no transactions, so both analyses would only report being skipped
+            **({} if is_summary else {
+                'sales_trends': self.analyze_sales_trends(),
+                'menu_performance': self.analyze_menu_performance()
+            }),
+            'ai_insights': self.generate_ai_insights(revenue_impact=revenue_impact,
+                                                     recommendations=recommendations,
+                                                     quality_data=quality_data,
+                                                     summary_data=summary_data),
             'generated_at': datetime.now().isoformat(),
             'business_summary': {
                 'total_data_points': len(self.data) if self.data is not None else 0,
@@ -643,8 +1158,26 @@ class RestaurantDataAI:
             }
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        # Written one top-level section at a time, so only that section's JSON is held in memory.
+        # Each is serialized as a one-key object and has its braces stripped, which keeps the
+        # indentation identical to dumping the whole dict at once.
+        if orjson is not None:
+            options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            with open(output_file, 'wb') as f:
+                f.write(b"{\n")
+                for i, (key, value) in enumerate(results.items()):
+                    if i:
+                        f.write(b",\n")
+                    f.write(orjson.dumps({key: value}, default=str, option=options)[2:-2])
+                f.write(b"\n}")
+        else:
+            with open(output_file, 'w') as f:
+                f.write("{\n")
+                for i, (key, value) in enumerate(results.items()):
+                    if i:
+                        f.write(",\n")
+                    f.write(json.dumps({key: value}, indent=2, default=str)[2:-2])
+                f.write("\n}")
         
         print(f"Business Strategy Analysis exported to {output_file}")
         return results
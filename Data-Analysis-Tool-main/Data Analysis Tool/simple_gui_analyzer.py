@@ -7,7 +7,66 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import os
 import threading
-from restaurant_ai_analyzer import RestaurantDataAI
+import itertools
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing import Pool
+from pathlib import Path
+import pandas as pd
+from restaurant_ai_analyzer import RestaurantDataAI, EXCEL_ENGINE, list_sheet_names
+
+# Cap the results log so repeated analyses don't grow the widget without bound
+MAX_LOG_LINES = 5000
+TRIM_LOG_LINES = 1000
+
+EXCEL_EXTENSIONS = frozenset({'.xlsx', '.xls'})
+
+# Workbook kept open in the analysis process so re-analyzing another sheet skips re-opening it
+_open_workbook = {}
+
+def _get_workbook(file_path):
+    """Return an ExcelFile for the path, reusing the last one if the file is unchanged"""
+    key = (file_path, os.path.getmtime(file_path))
+    if key not in _open_workbook:
+        for excel_file in _open_workbook.values():
+            excel_file.close()
+        _open_workbook.clear()
+        _open_workbook[key] = pd.ExcelFile(file_path, engine=EXCEL_ENGINE)
+    return _open_workbook[key]
+
+# Analyzer of the last analysis, kept in the worker process (with its cached results) for the export
+_last_analysis = {}
+
+def _do_analysis(file_path, sheet_name=None):
+    """Load and analyze a file - runs in the analysis worker process
+    
+    Only the result dicts go back to the GUI; the analyzer and its data stay here.
+    """
+    _last_analysis.clear()
+    excel_file = None
+    if Path(file_path).suffix.lower() in EXCEL_EXTENSIONS:
+        excel_file = _get_workbook(file_path)
+    
+    analyzer = RestaurantDataAI()
+    if not analyzer.load_data(file_path, sheet_name=sheet_name, excel_file=excel_file):
+        return {'success': False}
+    
+    _last_analysis[(file_path, sheet_name)] = analyzer
+    return {
+        'success': True,
+        'shape': analyzer.data.shape,
+        'column_mapping': analyzer.column_mapping,
+        'insights': analyzer.generate_ai_insights(),
+        'sales_data': analyzer.analyze_sales_trends(),
+        'menu_data': analyzer.analyze_menu_performance()
+    }
+
+def _do_export(file_path, sheet_name, output_file):
+    """Export the last analysis of the file - runs in the analysis worker process"""
+    analyzer = _last_analysis.get((file_path, sheet_name))
+    if analyzer is None:
+        raise RuntimeError("The analysis is no longer loaded - please analyze the file again")
+    analyzer.export_analysis(output_file)
 
 class SimpleAnalyzerGUI:
     def __init__(self):
@@ -16,9 +75,22 @@ class SimpleAnalyzerGUI:
         self.root.geometry("900x700")
         self.root.configure(bg='#f0f0f0')
         
-        self.analyzer = RestaurantDataAI()
         self.current_file = None
+        self._analyzed = None  # (file_path, sheet_name) of the analysis the worker process holds
+        self._is_excel = False
         self.available_sheets = []
+        
+        # Log lines queued by worker threads, flushed to the widget in batches
+        self._log_buffer = deque()
+        self._log_lock = threading.Lock()
+        self._flush_pending = False
+        
+        # Loading and analysis are CPU-bound, so they run in a separate process. It is a
+        # multiprocessing Pool so closing the window can terminate a task instead of waiting for it
+        self._pool = Pool(processes=1)
+        self.closing = False
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        
         self.setup_gui()
         
     def setup_gui(self):
@@ -114,7 +186,8 @@ class SimpleAnalyzerGUI:
             width=100,
             font=("Consolas", 9),
             bg='#ffffff',
-            fg='#2c3e50'
+            fg='#2c3e50',
+            state='disabled'
         )
         self.results_text.pack(pady=5, padx=20, fill='both', expand=True)
         
@@ -168,12 +241,13 @@ class SimpleAnalyzerGUI:
         
         if file_path:
             self.current_file = file_path
+            # Check the file type once per selection
+            self._is_excel = Path(file_path).suffix.lower() in EXCEL_EXTENSIONS
             file_name = os.path.basename(file_path)
             self.file_label.config(text=f"Selected: {file_name}")
             
             # Check if it's an Excel file and show sheets
-            file_ext = os.path.splitext(file_path.lower())[1]
-            if file_ext in ['.xlsx', '.xls']:
+            if self._is_excel:
                 self.load_excel_sheets(file_path)
             else:
                 self.hide_sheet_selection()
@@ -182,9 +256,7 @@ class SimpleAnalyzerGUI:
     def load_excel_sheets(self, file_path):
         """Load and display Excel sheet options"""
         try:
-            import pandas as pd
-            excel_file = pd.ExcelFile(file_path)
-            self.available_sheets = excel_file.sheet_names
+            self.available_sheets = list_sheet_names(file_path)
             
             # Show sheet selection
             self.sheet_label.pack(side='left')
@@ -199,13 +271,13 @@ class SimpleAnalyzerGUI:
                 'Revenue summary', 'Menu Item', 'Sales'
             ]
             
-            # Select the best default sheet
+            # Select the best default sheet - lowercase the names once, stop at the first match
+            sheets_lc = [sheet.lower() for sheet in self.available_sheets]
             default_sheet = None
             for suggested in suggested_sheets:
-                for sheet in self.available_sheets:
-                    if suggested.lower() in sheet.lower():
-                        default_sheet = sheet
-                        break
+                sug_lc = suggested.lower()
+                default_sheet = next((self.available_sheets[i] for i in range(len(sheets_lc))
+                                      if sug_lc in sheets_lc[i]), None)
                 if default_sheet:
                     break
             
@@ -247,58 +319,64 @@ class SimpleAnalyzerGUI:
         
         # Determine sheet name for Excel files
         sheet_name = None
-        file_ext = os.path.splitext(self.current_file.lower())[1]
-        if file_ext in ['.xlsx', '.xls'] and self.sheet_combo.get():
+        if self._is_excel and self.sheet_combo.get():
             sheet_name = self.sheet_combo.get()
         
-        # Run analysis in separate thread
-        thread = threading.Thread(
-            target=self.run_analysis, 
-            args=(self.current_file, sheet_name)
-        )
-        thread.daemon = True
-        thread.start()
+        file_name = os.path.basename(self.current_file)
+        if sheet_name:
+            self.log_message(f"🔍 Analyzing: {file_name} (Sheet: {sheet_name})")
+        else:
+            self.log_message(f"🔍 Analyzing: {file_name}")
+        
+        # Run analysis in the worker process, show the results from the main thread
+        analyzed = (self.current_file, sheet_name)
+        self._submit(_do_analysis, analyzed, self._show_results, analyzed)
+    
+    def _submit(self, task, args, on_done, *done_args):
+        """Run task(*args) in the worker process, then call on_done(future, *done_args) on the main thread"""
+        future = Future()
+        future.add_done_callback(lambda f: self._deliver(on_done, f, *done_args))
+        self._pool.apply_async(task, args, callback=future.set_result, error_callback=future.set_exception)
     
-    def run_analysis(self, file_path, sheet_name=None):
-        """Run the analysis in a separate thread"""
+    def _deliver(self, on_done, *args):
+        """Hand a finished task to the main thread - runs on the pool's result thread"""
+        if self.closing:
+            return
         try:
-            file_name = os.path.basename(file_path)
-            
-            if sheet_name:
-                self.log_message(f"🔍 Analyzing: {file_name} (Sheet: {sheet_name})")
-            else:
-                self.log_message(f"🔍 Analyzing: {file_name}")
-            
-            # Load the data
-            if sheet_name:
-                success = self.analyzer.load_data(file_path, sheet_name=sheet_name)
-            else:
-                success = self.analyzer.load_data(file_path)
+            self.root.after(0, on_done, *args)
+        except (tk.TclError, RuntimeError):
+            pass  # The window was destroyed between the check and the call
+    
+    def _show_results(self, future, analyzed):
+        """Display the worker's analysis results (runs on the main thread)"""
+        if self.closing:
+            return
+        try:
+            result = future.result()
             
-            if success:
+            if result['success']:
+                # The worker keeps the analyzer; export asks it for this analysis
+                self._analyzed = analyzed
                 self.log_message("✅ Data loaded successfully!")
                 
                 # Show data overview
-                rows = len(self.analyzer.data)
-                cols = len(self.analyzer.data.columns)
+                rows, cols = result['shape']
                 self.log_message(f"📋 Data Overview: {rows:,} rows, {cols} columns")
                 
                 # Show column mapping
-                if self.analyzer.column_mapping:
+                if result['column_mapping']:
                     self.log_message("\n🏷️  Detected Data Columns:")
-                    for data_type, column in self.analyzer.column_mapping.items():
+                    for data_type, column in result['column_mapping'].items():
                         self.log_message(f"   {data_type}: {column}")
                 
-                # Generate insights
-                self.log_message("\n🧠 Generating AI insights...")
-                insights = self.analyzer.generate_ai_insights()
+                insights = result['insights']
                 
                 self.log_message("\n💡 AI INSIGHTS FOR WHICH WICH:")
                 for i, insight in enumerate(insights, 1):
                     self.log_message(f"   {i}. {insight}")
                 
                 # Sales analysis
-                sales_data = self.analyzer.analyze_sales_trends()
+                sales_data = result['sales_data']
                 if 'error' not in sales_data:
                     self.log_message("\n📈 SALES ANALYSIS:")
                     self.log_message(f"   💰 Total Revenue: ${sales_data['total_revenue']:,.2f}")
@@ -315,7 +393,7 @@ class SimpleAnalyzerGUI:
                     self.log_message(f"\n⚠️  Sales Analysis: {sales_data.get('error', 'Unknown error')}")
                 
                 # Menu analysis
-                menu_data = self.analyzer.analyze_menu_performance()
+                menu_data = result['menu_data']
                 if 'error' not in menu_data:
                     self.log_message("\n🍖 MENU PERFORMANCE:")
                     self.log_message(f"   📋 Unique Items: {menu_data['total_unique_items']}")
@@ -323,7 +401,7 @@ class SimpleAnalyzerGUI:
                     
                     # Show top items
                     if menu_data.get('top_revenue_items'):
-                        top_items = list(menu_data['top_revenue_items'].keys())[:3]
+                        top_items = list(itertools.islice(menu_data['top_revenue_items'], 3))
                         self.log_message(f"   🏆 Top Items: {', '.join(top_items)}")
                 else:
                     self.log_message(f"\n⚠️  Menu Analysis: {menu_data.get('error', 'Unknown error')}")
@@ -331,7 +409,7 @@ class SimpleAnalyzerGUI:
                 self.log_message(f"\n✅ Analysis Complete! 🎉")
                 
                 # Enable export button
-                self.root.after(0, lambda: self.export_button.config(state='normal'))
+                self.export_button.config(state='normal')
                 
             else:
                 self.log_message("❌ Failed to load data file")
@@ -341,21 +419,43 @@ class SimpleAnalyzerGUI:
         
         finally:
             # Stop progress bar and re-enable button
-            self.root.after(0, self.progress.stop)
-            self.root.after(0, lambda: self.analyze_button.config(state='normal'))
+            self.progress.stop()
+            self.analyze_button.config(state='normal')
     
     def log_message(self, message):
         """Add message to results area"""
-        def update_text():
-            self.results_text.insert(tk.END, message + "\n")
-            self.results_text.see(tk.END)
+        with self._log_lock:
+            self._log_buffer.append(message)
+            if self._flush_pending:
+                return
+            self._flush_pending = True
+        
+        # Call from main thread - one flush covers every message queued until it runs
+        self.root.after(30, self._flush_logs)
+    
+    def _flush_logs(self):
+        """Write all queued messages to the results area in a single insert"""
+        with self._log_lock:
+            lines = list(self._log_buffer)
+            self._log_buffer.clear()
+            self._flush_pending = False
+        
+        self.results_text.config(state='normal')
+        self.results_text.insert(tk.END, "\n".join(lines) + "\n")
         
-        # Call from main thread
-        self.root.after(0, update_text)
+        # Drop the oldest block of lines in one call once the log gets too long
+        line_count = int(self.results_text.index('end-1c').split('.')[0])
+        if line_count > MAX_LOG_LINES:
+            self.results_text.delete('1.0', f'{TRIM_LOG_LINES + 1}.0')
+        
+        self.results_text.config(state='disabled')
+        self.results_text.see(tk.END)
     
     def clear_results(self):
         """Clear the results area"""
+        self.results_text.config(state='normal')
         self.results_text.delete(1.0, tk.END)
+        self.results_text.config(state='disabled')
         self.export_button.config(state='disabled')
     
     def export_analysis(self):
@@ -368,17 +468,39 @@ class SimpleAnalyzerGUI:
             )
             
             if output_file:
-                self.analyzer.export_analysis(output_file)
-                self.log_message(f"💾 Analysis exported to: {output_file}")
-                messagebox.showinfo("Export Complete", f"Analysis saved to:\n{output_file}")
+                # The export runs where the analysis was done, reusing its cached results
+                self.export_button.config(state='disabled')
+                self._submit(_do_export, (*self._analyzed, output_file), self._export_done, output_file)
         
         except Exception as e:
             self.log_message(f"❌ Export error: {e}")
             messagebox.showerror("Export Error", f"Failed to export: {e}")
     
+    def _export_done(self, future, output_file):
+        """Report the worker's export (runs on the main thread)"""
+        if self.closing:
+            return
+        self.export_button.config(state='normal')
+        try:
+            future.result()
+            self.log_message(f"💾 Analysis exported to: {output_file}")
+            messagebox.showinfo("Export Complete", f"Analysis saved to:\n{output_file}")
+        except Exception as e:
+            self.log_message(f"❌ Export error: {e}")
+            messagebox.showerror("Export Error", f"Failed to export: {e}")
+    
+    def close(self):
+        """Close the window, stopping any analysis or export still running in the worker process"""
+        self.closing = True
+        self._pool.terminate()
+        self.root.destroy()
+    
     def run(self):
         """Start the GUI"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self._pool.terminate()
 
 if __name__ == "__main__":
     app = SimpleAnalyzerGUI()
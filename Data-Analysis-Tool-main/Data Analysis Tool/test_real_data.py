@@ -3,7 +3,7 @@
 Test the Restaurant AI Analyzer with real Toast data (CSV or Excel)
 """
 
-from restaurant_ai_analyzer import RestaurantDataAI
+from restaurant_ai_analyzer import RestaurantDataAI, EXCEL_ENGINE
 import os
 
 def main():
@@ -31,7 +31,7 @@ def main():
         # For Excel files, check if user wants to specify a sheet
         import pandas as pd
         try:
-            excel_file = pd.ExcelFile(csv_file)
+            excel_file = pd.ExcelFile(csv_file, engine=EXCEL_ENGINE)
             sheet_names = excel_file.sheet_names
             print(f"📊 Available sheets: {sheet_names}")
             
@@ -62,7 +62,7 @@ def main():
         print(f"\n📄 First 3 rows:")
         print(analyzer.data.head(3).to_string())
         
-        print(f"\n🏷️  All columns: {list(analyzer.data.columns)}")
+        print(f"\n🏷️  All columns: {analyzer.data.columns.tolist()}")
         
         # Generate AI insights
         print("\n🧠 Generating AI insights...")
@@ -96,7 +96,7 @@ def main():
             print(f"   💵 Average Item Price: ${menu_data['average_item_price']:.2f}")
             
             if menu_data['top_revenue_items']:
-                top_item = list(menu_data['top_revenue_items'].keys())[0]
+                top_item = next(iter(menu_data['top_revenue_items']))
                 print(f"   🏆 Top Revenue Item: '{top_item}'")
         
     else:
@@ -4,9 +4,108 @@ from datetime import datetime, timedelta
 import json
 from typing import Dict, List, Tuple, Any, Optional
 import os
+import re
+import codecs
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
+# Prefer the Rust-based calamine reader for Excel files; None lets pandas pick
+# its default engine (openpyxl/xlrd) when python-calamine isn't installed
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
+# pyarrow's vectorized string kernels clean currency text without a Python call per cell
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+# orjson writes the report several times faster and handles numpy values natively
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Numba totals very large order tables across threads; np.bincount is the fallback
+try:
+    from numba import njit, prange, get_num_threads
+except ImportError:
+    njit = None
+
+# Currency symbols stripped from price text, compiled once for the pandas path
+CURRENCY_PATTERN = r'[\$,]'
+CURRENCY_RE = re.compile(CURRENCY_PATTERN)
+
+# Text pd.to_numeric accepts once currency symbols and padding are gone (matched case-insensitively)
+NUMBER_PATTERN = r'^[+-]?((\d+\.?\d*|\.\d+)(e[+-]?\d+)?|inf|infinity|nan)$'
+
+# Bucket labels for the temporal analysis, indexed by dt.hour and dt.dayofweek
+HOURS = tuple(range(24))
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Rows read up front to preview and map a file before its mapped columns are loaded in full
+SAMPLE_ROWS = 500
+
+# Rows above which orders and item revenue are totalled in parallel - below it the JIT start-up isn't worth it
+PARALLEL_ORDER_ROWS = 1_000_000
+
+# Partial-total cells the parallel kernel may allocate beyond twice the number of groups
+PARTIAL_TOTALS_CELLS = 1 << 20
+
+def _order_totals(codes, values, present, n_orders):
+    """Value sum and item count per order code, counting only the present cells"""
+    sums = np.bincount(codes, weights=np.where(present, values, 0.0), minlength=n_orders)
+    return sums, np.bincount(codes, weights=present, minlength=n_orders).astype(np.int64)
+
+def _order_totals_loop(codes, values, present, lows, offsets, n_orders):
+    """Same totals as _order_totals, split into len(lows) row chunks totalled on separate threads (compiled by numba)
+    
+    Chunk c only has partials for the codes from lows[c] up to its largest code, stored in
+    offsets[c]:offsets[c + 1] of one shared buffer.
+    """
+    n_chunks = lows.size
+    partial_sums = np.zeros(offsets[-1])
+    partial_counts = np.zeros(offsets[-1], np.int64)
+    for chunk in prange(n_chunks):
+        base = offsets[chunk] - lows[chunk]
+        for i in range(chunk * codes.size // n_chunks, (chunk + 1) * codes.size // n_chunks):
+            if present[i]:
+                partial_sums[base + codes[i]] += values[i]
+                partial_counts[base + codes[i]] += 1
+    
+    sums = np.zeros(n_orders)
+    counts = np.zeros(n_orders, np.int64)
+    for chunk in range(n_chunks):
+        for k in range(offsets[chunk + 1] - offsets[chunk]):
+            sums[lows[chunk] + k] += partial_sums[offsets[chunk] + k]
+            counts[lows[chunk] + k] += partial_counts[offsets[chunk] + k]
+    return sums, counts
+
+_order_totals_parallel = njit(parallel=True, cache=True)(_order_totals_loop) if njit is not None else None
+
+def _totals_by_code(codes, values, present, n_groups):
+    """Per-code value sums and present counts, spread over threads for large tables when numba is installed
+    
+    The kernel only runs on the main thread: started from another thread, numba's TBB pool
+    can keep the interpreter from exiting. It also needs each row chunk to cover a narrow
+    range of codes, as with orders whose line items sit together, so that the partials stay
+    within PARTIAL_TOTALS_CELLS beyond twice the number of groups.
+    """
+    if (_order_totals_parallel is not None and len(codes) > PARALLEL_ORDER_ROWS
+            and threading.current_thread() is threading.main_thread()):
+        starts = np.arange(get_num_threads()) * len(codes) // get_num_threads()
+        lows = np.minimum.reduceat(codes, starts)
+        offsets = np.concatenate(([0], np.cumsum(np.maximum.reduceat(codes, starts) - lows + 1)))
+        if offsets[-1] <= 2 * n_groups + PARTIAL_TOTALS_CELLS:
+            return _order_totals_parallel(codes, values, present, lows, offsets, n_groups)
+    return _order_totals(codes, values, present, n_groups)
+
 @dataclass
 class ColumnMapping:
     """Define the expected data structure"""
@@ -28,20 +127,34 @@ class DataLoader:
     """Handle loading and initial processing of restaurant data"""
     
     @staticmethod
-    def load_file(file_path: str, sheet_name: str = None) -> pd.DataFrame:
-        """Load CSV or Excel file with proper error handling"""
-        file_path = Path(file_path)
-        
+    def load_file(file_path: str, sheet_name: str = None, downcast: bool = False,
+                  excel_file: pd.ExcelFile = None, usecols: List[str] = None,
+                  nrows: int = None) -> pd.DataFrame:
+        """Load CSV or Excel file with proper error handling, optionally downcasting its dtypes
+        
+        An Excel workbook the caller already opened (to list its sheets) can be passed as
+        excel_file so it is parsed without reading the file again. usecols and nrows limit
+        the read to those columns and the first rows, as in pd.read_csv.
+        """
+        df = DataLoader._read_file(Path(file_path), sheet_name, excel_file, usecols, nrows)
+        return DataLoader.downcast(df) if downcast else df
+    
+    @staticmethod
+    def _read_file(file_path: Path, sheet_name: str = None, excel_file: pd.ExcelFile = None,
+                   usecols: List[str] = None, nrows: int = None) -> pd.DataFrame:
+        """Read the CSV or Excel file as pandas parses it"""
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
         file_ext = file_path.suffix.lower()
         
         if file_ext == '.csv':
-            # Try different encodings for CSV
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
+            # Sniff the encoding from the start of the file so a non-UTF-8 file is parsed once,
+            # not after a failed UTF-8 pass; latin-1 decodes any byte, so it is the last resort
+            encodings = [DataLoader.sniff_encoding(file_path), 'latin-1']
+            for encoding in dict.fromkeys(encodings):
                 try:
-                    df = pd.read_csv(file_path, encoding=encoding)
+                    df = DataLoader.read_csv(file_path, encoding, usecols, nrows)
                     print(f"✅ Loaded CSV with {encoding} encoding: {len(df)} rows")
                     return df
                 except UnicodeDecodeError:
@@ -49,29 +162,82 @@ class DataLoader:
             raise ValueError("Could not read CSV with any encoding")
             
         elif file_ext in ['.xlsx', '.xls']:
-            if sheet_name:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-                print(f"✅ Loaded Excel sheet '{sheet_name}': {len(df)} rows")
-            else:
-                # Show available sheets and load first one
-                excel_file = pd.ExcelFile(file_path)
-                print(f"📋 Available sheets: {excel_file.sheet_names}")
-                df = pd.read_excel(file_path, sheet_name=excel_file.sheet_names[0])
-                print(f"✅ Loaded sheet '{excel_file.sheet_names[0]}': {len(df)} rows")
-            return df
+            if excel_file is not None:
+                return DataLoader._parse_sheet(excel_file, sheet_name, usecols, nrows)
+            with pd.ExcelFile(file_path, engine=EXCEL_ENGINE) as excel_file:
+                return DataLoader._parse_sheet(excel_file, sheet_name, usecols, nrows)
         else:
             raise ValueError(f"Unsupported file format: {file_ext}")
     
     @staticmethod
-    def inspect_data(df: pd.DataFrame) -> Dict[str, Any]:
+    def _parse_sheet(excel_file: pd.ExcelFile, sheet_name: str = None, usecols: List[str] = None,
+                     nrows: int = None) -> pd.DataFrame:
+        """Parse one sheet of an open workbook, listing the sheets and taking the first if none is named"""
+        if sheet_name:
+            df = excel_file.parse(sheet_name, usecols=usecols, nrows=nrows)
+            print(f"✅ Loaded Excel sheet '{sheet_name}': {len(df)} rows")
+        else:
+            print(f"📋 Available sheets: {excel_file.sheet_names}")
+            df = excel_file.parse(excel_file.sheet_names[0], usecols=usecols, nrows=nrows)
+            print(f"✅ Loaded sheet '{excel_file.sheet_names[0]}': {len(df)} rows")
+        return df
+    
+    @staticmethod
+    def read_csv(file_path: Path, encoding: str, usecols: List[str] = None, nrows: int = None) -> pd.DataFrame:
+        """Parse a CSV with pyarrow's multithreaded reader when available, else the C parser"""
+        # pyarrow can't stop after the first rows, so a sample is left to the C parser
+        if pa is not None and nrows is None:
+            try:
+                df = pd.read_csv(file_path, encoding=encoding, engine='pyarrow', usecols=usecols)
+            except Exception:
+                df = None  # pyarrow rejects some malformed files the C parser copes with
+            # Text pyarrow can't decode comes back as a column of bytes rather than an error;
+            # leave those files to the C parser so the encoding fallback still sees the failure
+            if df is not None and not any(
+                    series.dtype == object and isinstance(series.get(series.first_valid_index()), bytes)
+                    for _, series in df.items()):
+                return df
+        return pd.read_csv(file_path, encoding=encoding, usecols=usecols, nrows=nrows)
+    
+    @staticmethod
+    def downcast(df: pd.DataFrame, category_ratio: float = 0.5) -> pd.DataFrame:
+        """Shrink integer columns to the smallest integer dtype and repeating text to categories
+        
+        Floats stay float64 so revenue totals are unchanged.
+        """
+        df = df.copy(deep=False)
+        for column in df.columns:
+            series = df[column]
+            if pd.api.types.is_integer_dtype(series):
+                df[column] = pd.to_numeric(series, downcast='integer')
+            elif series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+                if series.nunique() < category_ratio * len(series):
+                    df[column] = series.astype('category')
+        return df
+    
+    @staticmethod
+    def sniff_encoding(file_path: Path, sample_size: int = 65536) -> str:
+        """Guess a CSV's encoding from its first bytes: utf-8 if they decode as UTF-8, else latin-1"""
+        with open(file_path, 'rb') as f:
+            head = f.read(sample_size)
+        try:
+            # Not final, so a multi-byte character cut off at the end of the sample is accepted
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'latin-1'
+    
+    @staticmethod
+    def inspect_data(df: pd.DataFrame, cache: Dict = None, deep_memory: bool = False) -> Dict[str, Any]:
         """Get comprehensive data overview"""
         return {
             'shape': df.shape,
             'columns': list(df.columns),
             'dtypes': df.dtypes.to_dict(),
-            'missing_values': df.isnull().sum().to_dict(),
+            'missing_values': DataCleaner.missing_counts(df, cache).to_dict(),
             'sample_data': df.head().to_dict('records'),
-            'memory_usage': df.memory_usage(deep=True).sum(),
+            # deep=True sizes every text cell in Python, so it is only done on request
+            'memory_usage': df.memory_usage(deep=deep_memory).sum(),
             'numeric_columns': df.select_dtypes(include=[np.number]).columns.tolist(),
             'text_columns': df.select_dtypes(include=['object']).columns.tolist(),
             'date_like_columns': [col for col in df.columns if any(keyword in col.lower() 
@@ -84,22 +250,72 @@ class DataCleaner:
     @staticmethod
     def clean_currency_column(series: pd.Series) -> pd.Series:
         """Clean currency columns (remove $, commas, etc.)"""
+        if isinstance(series.dtype, pd.CategoricalDtype) and series.cat.categories.dtype == object:
+            # A downcast text column: clean each distinct value once and spread them over the rows,
+            # missing cells (code -1) picking up the NaN appended at the end
+            categories = DataCleaner.clean_currency_column(pd.Series(series.cat.categories))
+            values = np.append(categories.to_numpy(dtype=np.float64), np.nan)
+            return pd.Series(values[series.cat.codes.to_numpy()], index=series.index, name=series.name)
         if series.dtype == 'object':
+            if pa is not None and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+                # Same result as the regex + to_numeric path below, computed in Arrow
+                values = pa.array(series, type=pa.string(), from_pandas=True)
+                values = pc.utf8_trim_whitespace(pc.replace_substring_regex(values, CURRENCY_PATTERN, ''))
+                values = pc.if_else(pc.match_substring_regex(values, NUMBER_PATTERN, ignore_case=True),
+                                    values, None)
+                return pd.Series(values.cast(pa.float64()).to_numpy(zero_copy_only=False),
+                                 index=series.index, name=series.name)
+            
             # Remove currency symbols and convert to float
-            cleaned = series.str.replace(r'[\$,]', '', regex=True)
+            cleaned = series.str.replace(CURRENCY_RE, '', regex=True)
             return pd.to_numeric(cleaned, errors='coerce')
         return series
     
     @staticmethod
-    def clean_date_column(series: pd.Series) -> pd.Series:
-        """Standardize date formats"""
-        return pd.to_datetime(series, errors='coerce')
+    def clean_date_column(series: pd.Series, date_format: str = None) -> pd.Series:
+        """Standardize date formats, optionally pinned to a known strftime format"""
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+        # Without a format pandas infers one from the first non-null value; the cache parses
+        # each repeated timestamp string once
+        return pd.to_datetime(series, errors='coerce', format=date_format, cache=True)
     
     @staticmethod
     def clean_text_column(series: pd.Series) -> pd.Series:
         """Clean text data"""
+        if pa is not None and series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+            values = pa.array(series, type=pa.string(), from_pandas=True)
+            # Arrow's title-casing only agrees with str.title() on ASCII text
+            if pc.all(pc.string_is_ascii(values)).as_py() is not False:
+                cleaned = pd.Series(pc.utf8_title(pc.utf8_trim_whitespace(values)).to_numpy(zero_copy_only=False),
+                                    index=series.index)
+                # Keep the missing markers (None vs NaN) the .str accessor would pass through
+                return cleaned.where(series.notna(), series)
         return series.str.strip().str.title()
     
+    @classmethod
+    def get_clean(cls, df: pd.DataFrame, column: str, kind: str, cache: Dict = None) -> pd.Series:
+        """Clean df[column] as 'currency', 'date' or 'text', reusing the result stored in cache"""
+        cleaner = getattr(cls, f'clean_{kind}_column')
+        if cache is None:
+            return cleaner(df[column])
+        
+        key = (id(df), column, kind)
+        if key not in cache:
+            cache[key] = cleaner(df[column])
+        return cache[key]
+    
+    @staticmethod
+    def missing_counts(df: pd.DataFrame, cache: Dict = None) -> pd.Series:
+        """Null count per column, reusing the result stored in cache"""
+        if cache is None:
+            return df.isnull().sum()
+        
+        key = (id(df), None, 'missing')
+        if key not in cache:
+            cache[key] = df.isnull().sum()
+        return cache[key]
+    
     @staticmethod
     def remove_duplicates(df: pd.DataFrame, subset: List[str] = None) -> pd.DataFrame:
         """Remove duplicate rows"""
@@ -111,9 +327,11 @@ class DataCleaner:
         return df_cleaned
     
     @staticmethod
-    def handle_missing_values(df: pd.DataFrame, strategy: str = 'report') -> pd.DataFrame:
-        """Handle missing values based on strategy"""
-        missing_summary = df.isnull().sum()
+    def handle_missing_values(df: pd.DataFrame, strategy: str = 'report',
+                              missing_summary: pd.Series = None) -> pd.DataFrame:
+        """Handle missing values based on strategy, given the null counts if already known"""
+        if missing_summary is None:
+            missing_summary = df.isnull().sum()
         missing_pct = (missing_summary / len(df) * 100).round(2)
         
         print("Missing Values Summary:")
@@ -150,15 +368,18 @@ class ColumnMapper:
     @classmethod
     def auto_detect_columns(cls, df: pd.DataFrame) -> ColumnMapping:
         """Automatically detect column mappings"""
-        columns_lower = df.columns.str.lower().str.strip()
         mapping = ColumnMapping()
         
-        for field_name, keywords in cls.DETECTION_PATTERNS.items():
-            for col_lower in columns_lower:
+        # Visit each column once, binding every still-unfilled field it matches; each field
+        # still ends up with the first matching column, and the scan stops once all are bound
+        unfilled = dict(cls.DETECTION_PATTERNS)
+        for col_lower, original_col in zip(df.columns.str.lower().str.strip(), df.columns):
+            for field_name, keywords in list(unfilled.items()):
                 if any(keyword in col_lower for keyword in keywords):
-                    original_col = df.columns[columns_lower.get_loc(col_lower)]
                     setattr(mapping, field_name, original_col)
-                    break
+                    del unfilled[field_name]
+            if not unfilled:
+                break
         
         return mapping
     
@@ -170,22 +391,23 @@ class ColumnMapper:
     @staticmethod
     def validate_mapping(df: pd.DataFrame, mapping: ColumnMapping) -> Dict[str, bool]:
         """Validate that mapped columns exist in dataframe"""
+        columns = set(df.columns)
         validation = {}
         for field_name, column_name in mapping.__dict__.items():
             if column_name is not None:
-                validation[field_name] = column_name in df.columns
+                validation[field_name] = column_name in columns
         return validation
 
 class SalesAnalyzer:
     """Core sales analysis functionality"""
     
     @staticmethod
-    def calculate_basic_metrics(df: pd.DataFrame, mapping: ColumnMapping) -> Dict[str, Any]:
+    def calculate_basic_metrics(df: pd.DataFrame, mapping: ColumnMapping, cache: Dict = None) -> Dict[str, Any]:
         """Calculate fundamental sales metrics"""
         if not mapping.price:
             return {"error": "Price column required"}
         
-        price_series = DataCleaner.clean_currency_column(df[mapping.price])
+        price_series = DataCleaner.get_clean(df, mapping.price, 'currency', cache)
         
         return {
             'total_revenue': float(price_series.sum()),
@@ -198,61 +420,109 @@ class SalesAnalyzer:
         }
     
     @staticmethod
-    def analyze_temporal_patterns(df: pd.DataFrame, mapping: ColumnMapping) -> Dict[str, Any]:
+    def analyze_temporal_patterns(df: pd.DataFrame, mapping: ColumnMapping, cache: Dict = None) -> Dict[str, Any]:
         """Analyze sales patterns over time"""
         if not mapping.date or not mapping.price:
             return {"error": "Date and price columns required"}
         
-        df_temp = df.copy()
-        df_temp['clean_date'] = DataCleaner.clean_date_column(df_temp[mapping.date])
-        df_temp['clean_price'] = DataCleaner.clean_currency_column(df_temp[mapping.price])
+        # Work on the two cleaned columns rather than a copy of the whole frame
+        clean_date = DataCleaner.get_clean(df, mapping.date, 'date', cache)
+        clean_price = DataCleaner.get_clean(df, mapping.price, 'currency', cache)
         
         # Remove invalid dates/prices
-        df_temp = df_temp.dropna(subset=['clean_date', 'clean_price'])
+        valid = clean_date.notna() & clean_price.notna()
+        dates = clean_date[valid].dt
+        prices = clean_price[valid]
         
         # Extract time components
-        df_temp['hour'] = df_temp['clean_date'].dt.hour
-        df_temp['day_of_week'] = df_temp['clean_date'].dt.day_name()
-        df_temp['date_only'] = df_temp['clean_date'].dt.date
-        df_temp['month'] = df_temp['clean_date'].dt.to_period('M')
+        date_only = dates.date
         
         return {
             'date_range': {
-                'start': str(df_temp['date_only'].min()),
-                'end': str(df_temp['date_only'].max()),
-                'total_days': (df_temp['date_only'].max() - df_temp['date_only'].min()).days
+                'start': str(date_only.min()),
+                'end': str(date_only.max()),
+                'total_days': (date_only.max() - date_only.min()).days
             },
-            'hourly_sales': df_temp.groupby('hour')['clean_price'].agg(['sum', 'count', 'mean']).round(2).to_dict(),
-            'daily_sales': df_temp.groupby('day_of_week')['clean_price'].agg(['sum', 'count', 'mean']).round(2).to_dict(),
-            'daily_totals': df_temp.groupby('date_only')['clean_price'].sum().round(2).to_dict()
+            'hourly_sales': SalesAnalyzer.bucket_summary(*SalesAnalyzer.bucket_totals(dates.hour, prices, 24), HOURS),
+            'daily_sales': SalesAnalyzer.bucket_summary(*SalesAnalyzer.bucket_totals(dates.dayofweek, prices, 7), DAY_NAMES),
+            'daily_totals': SalesAnalyzer.iso_keyed(prices.groupby(date_only).sum().round(2))
+        }
+    
+    @staticmethod
+    def iso_keyed(totals: pd.Series) -> Dict[str, float]:
+        """Per-day totals keyed by ISO date strings, which every JSON writer accepts as keys"""
+        return dict(zip(map(str, totals.index), totals.tolist()))
+    
+    @staticmethod
+    def with_mean(totals: pd.DataFrame) -> pd.DataFrame:
+        """Grouped sum/count totals as a rounded sum, count, mean frame, the mean derived from the two"""
+        totals = totals.sort_index()
+        totals['count'] = totals['count'].astype(np.int64)
+        totals['mean'] = totals['sum'] / totals['count'].where(totals['count'] > 0)
+        return totals[['sum', 'count', 'mean']].round(2)
+    
+    @staticmethod
+    def bucket_totals(keys: pd.Series, prices: pd.Series, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Price sum and row count per small integer key (hour, day of week) via bincount"""
+        keys = keys.to_numpy(dtype=np.intp)
+        sums = np.bincount(keys, weights=prices.to_numpy(dtype=np.float64), minlength=size)
+        return sums, np.bincount(keys, minlength=size)
+    
+    @staticmethod
+    def bucket_summary(sums: np.ndarray, counts: np.ndarray, labels: Tuple) -> Dict[str, Dict]:
+        """Bucket totals in the shape groupby(...).agg(['sum', 'count', 'mean']).round(2).to_dict() gives"""
+        # groupby keeps only the buckets that occur, ordered by their label
+        order = sorted(np.flatnonzero(counts).tolist(), key=labels.__getitem__)
+        keys = [labels[i] for i in order]
+        sums, counts = sums[order], counts[order]
+        return {
+            'sum': dict(zip(keys, np.round(sums, 2).tolist())),
+            'count': dict(zip(keys, counts.tolist())),
+            'mean': dict(zip(keys, np.round(sums / counts, 2).tolist()))
         }
     
     @staticmethod
-    def analyze_item_performance(df: pd.DataFrame, mapping: ColumnMapping) -> Dict[str, Any]:
+    def summarize_item_counts(items: pd.Index, counts: np.ndarray) -> Dict[str, Any]:
+        """Unique item count, ten most ordered items and order-frequency buckets"""
+        # Sorting the per-item counts the way value_counts does keeps its order for ties
+        most_ordered = pd.Series(counts, index=items).sort_values(ascending=False).head(10)
+        
+        # One pass buckets every item: 1, 2-5 and 6+ orders
+        buckets = np.bincount(np.minimum(counts, 6), minlength=7)
+        return {
+            'total_unique_items': len(counts),
+            'most_ordered_items': most_ordered.to_dict(),
+            'item_frequency_distribution': {
+                'ordered_once': buckets[1],
+                'ordered_2_5_times': buckets[2:6].sum(),
+                'ordered_more_than_5': buckets[6]
+            }
+        }
+    
+    @staticmethod
+    def analyze_item_performance(df: pd.DataFrame, mapping: ColumnMapping, cache: Dict = None) -> Dict[str, Any]:
         """Analyze individual item performance"""
         if not mapping.item_name:
             return {"error": "Item name column required"}
         
-        df_temp = df.copy()
-        df_temp['clean_item'] = DataCleaner.clean_text_column(df_temp[mapping.item_name])
+        clean_item = DataCleaner.get_clean(df, mapping.item_name, 'text', cache)
         
-        # Basic item stats
-        item_counts = df_temp['clean_item'].value_counts()
-        
-        result = {
-            'total_unique_items': len(item_counts),
-            'most_ordered_items': item_counts.head(10).to_dict(),
-            'item_frequency_distribution': {
-                'ordered_once': (item_counts == 1).sum(),
-                'ordered_2_5_times': ((item_counts >= 2) & (item_counts <= 5)).sum(),
-                'ordered_more_than_5': (item_counts > 5).sum()
-            }
-        }
+        # Basic item stats - integer codes and a bincount instead of a hashed value_counts
+        codes, items = pd.factorize(clean_item, sort=False)
+        counts = np.bincount(codes[codes >= 0], minlength=len(items))
+        result = SalesAnalyzer.summarize_item_counts(items, counts)
         
         # Add revenue analysis if price column available
         if mapping.price:
-            df_temp['clean_price'] = DataCleaner.clean_currency_column(df_temp[mapping.price])
-            item_revenue = df_temp.groupby('clean_item')['clean_price'].agg(['sum', 'mean', 'count']).round(2)
+            clean_price = DataCleaner.get_clean(df, mapping.price, 'currency', cache)
+            # Total the prices straight over the factorized codes, like the order totals; with_mean
+            # sorts by item name as a groupby would, so ties in nlargest still resolve the same way
+            named = codes >= 0
+            present = clean_price.notna().to_numpy()[named]
+            values = clean_price.to_numpy(dtype=np.float64, na_value=np.nan)[named]
+            sums, price_counts = _totals_by_code(codes[named], values, present, len(items))
+            totals = pd.DataFrame({'sum': sums, 'count': price_counts}, index=items)
+            item_revenue = SalesAnalyzer.with_mean(totals)[['sum', 'mean', 'count']]
             result['top_revenue_items'] = item_revenue.nlargest(10, 'sum').to_dict('index')
             result['highest_avg_price_items'] = item_revenue.nlargest(10, 'mean').to_dict('index')
         
@@ -267,58 +537,208 @@ class OrderAnalyzer:
         if not mapping.order_id:
             return {"error": "Order ID column required"}
         
-        df_temp = df.copy()
+        # Factorize the order ids once and total each order over the codes,
+        # rather than a hashed groupby and a MultiIndex to flatten (missing ids are dropped)
+        codes, orders = pd.factorize(df[mapping.order_id], sort=False)
+        grouped = codes >= 0
+        codes = codes[grouped]
         
-        # Order-level aggregations
-        agg_dict = {}
+        # Items per order are the non-null price (or item name) cells, like groupby count
+        counted = df[mapping.price or mapping.item_name]
+        present = counted.notna().to_numpy()[grouped]
         if mapping.price:
-            agg_dict[mapping.price] = ['sum', 'count']
+            values = counted.to_numpy(dtype=np.float64, na_value=np.nan)[grouped]
         else:
-            agg_dict[mapping.item_name] = 'count'
-        
-        order_stats = df_temp.groupby(mapping.order_id).agg(agg_dict).round(2)
+            values = np.zeros(len(codes))
         
-        # Flatten column names
-        order_stats.columns = ['_'.join(col).strip() for col in order_stats.columns]
-        
-        if mapping.price:
-            price_col = f"{mapping.price}_sum"
-            items_col = f"{mapping.price}_count"
-        else:
-            price_col = None
-            items_col = f"{mapping.item_name}_count"
+        order_values, item_counts = _totals_by_code(codes, values, present, len(orders))
         
         result = {
-            'total_orders': len(order_stats),
-            'average_items_per_order': float(order_stats[items_col].mean()),
-            'median_items_per_order': float(order_stats[items_col].median()),
-            'max_items_in_order': int(order_stats[items_col].max()),
-            'single_item_orders': int((order_stats[items_col] == 1).sum())
+            'total_orders': len(orders),
+            'average_items_per_order': float(item_counts.mean()),
+            'median_items_per_order': float(np.median(item_counts)),
+            'max_items_in_order': int(item_counts.max()),
+            'single_item_orders': int((item_counts == 1).sum())
         }
         
-        if price_col:
+        if mapping.price:
+            order_values = order_values.round(2)
             result.update({
-                'average_order_value': float(order_stats[price_col].mean()),
-                'median_order_value': float(order_stats[price_col].median()),
-                'largest_order_value': float(order_stats[price_col].max())
+                'average_order_value': float(order_values.mean()),
+                'median_order_value': float(np.median(order_values)),
+                'largest_order_value': float(order_values.max())
             })
         
         return result
 
+class StreamingReport:
+    """Fold CSV chunks into the basic, temporal and item sections of the summary report
+    
+    Only per-group sums and counts (and the cleaned prices, for the median) are kept between
+    chunks, so the file never has to fit in memory as a DataFrame.
+    """
+    
+    def __init__(self, mapping: ColumnMapping):
+        self.mapping = mapping
+        self.row_count = 0
+        self.prices = []  # Cleaned, non-missing prices of each chunk
+        self.hourly = np.zeros((2, 24))  # Price sums and row counts per hour / day of week
+        self.daily = np.zeros((2, 7))
+        self.daily_totals = None
+        self.first_date = None
+        self.last_date = None
+        self.item_counts = None
+        self.item_revenue = None
+    
+    @staticmethod
+    def _combine(total: Optional[pd.DataFrame], part: pd.DataFrame) -> pd.DataFrame:
+        """Add one chunk's grouped sums/counts to the running totals"""
+        return part if total is None else total.add(part, fill_value=0)
+    
+    @staticmethod
+    def _combine_in_order(total: Optional[pd.Series], part: pd.Series) -> pd.Series:
+        """Like _combine, but keeping the labels in the order they were first seen across chunks"""
+        if total is None:
+            return part
+        order = total.index.append(part.index.difference(total.index, sort=False))
+        return total.add(part, fill_value=0).reindex(order)
+    
+    def update(self, chunk: pd.DataFrame):
+        """Fold one chunk into the running totals"""
+        mapping = self.mapping
+        self.row_count += len(chunk)
+        
+        clean_price = None
+        if mapping.price:
+            clean_price = DataCleaner.clean_currency_column(chunk[mapping.price])
+            self.prices.append(clean_price.dropna().to_numpy(dtype=np.float64))
+        
+        if mapping.date and mapping.price:
+            timed = pd.DataFrame({'clean_date': DataCleaner.clean_date_column(chunk[mapping.date]),
+                                  'clean_price': clean_price}).dropna()
+            if len(timed):
+                dates = timed['clean_date'].dt
+                prices = timed['clean_price']
+                self.hourly += np.stack(SalesAnalyzer.bucket_totals(dates.hour, prices, 24))
+                self.daily += np.stack(SalesAnalyzer.bucket_totals(dates.dayofweek, prices, 7))
+                date_only = dates.date
+                self.daily_totals = self._combine(self.daily_totals, prices.groupby(date_only).sum())
+                first, last = date_only.min(), date_only.max()
+                self.first_date = first if self.first_date is None else min(self.first_date, first)
+                self.last_date = last if self.last_date is None else max(self.last_date, last)
+        
+        if mapping.item_name:
+            clean_item = DataCleaner.clean_text_column(chunk[mapping.item_name])
+            # Counted in first-appearance order, as the in-memory analysis factorizes them, so
+            # items with equal counts are ranked the same way
+            codes, items = pd.factorize(clean_item, sort=False)
+            counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(items)), index=items)
+            self.item_counts = self._combine_in_order(self.item_counts, counts)
+            if clean_price is not None:
+                self.item_revenue = self._combine(self.item_revenue,
+                                                  clean_price.groupby(clean_item).agg(['sum', 'count']))
+    
+    def basic_metrics(self) -> Dict[str, Any]:
+        """Same result as SalesAnalyzer.calculate_basic_metrics"""
+        if not self.mapping.price:
+            return {"error": "Price column required"}
+        
+        prices = np.concatenate(self.prices) if self.prices else np.empty(0)
+        if prices.size == 0:
+            # pandas reports an empty sum as 0 and every other statistic as NaN
+            return {
+                'total_revenue': 0.0,
+                'transaction_count': self.row_count,
+                **dict.fromkeys(['average_transaction', 'median_transaction', 'max_transaction',
+                                 'min_transaction', 'std_transaction'], float('nan'))
+            }
+        return {
+            'total_revenue': float(prices.sum()),
+            'transaction_count': self.row_count,
+            'average_transaction': float(prices.mean()),
+            'median_transaction': float(np.median(prices)),
+            'max_transaction': float(prices.max()),
+            'min_transaction': float(prices.min()),
+            'std_transaction': float(prices.std(ddof=1)) if prices.size > 1 else float('nan')
+        }
+    
+    def temporal_patterns(self) -> Dict[str, Any]:
+        """Same result as SalesAnalyzer.analyze_temporal_patterns"""
+        if not self.mapping.date or not self.mapping.price:
+            return {"error": "Date and price columns required"}
+        if self.first_date is None:
+            return {"error": "No valid dates found"}
+        
+        return {
+            'date_range': {
+                'start': str(self.first_date),
+                'end': str(self.last_date),
+                'total_days': (self.last_date - self.first_date).days
+            },
+            'hourly_sales': SalesAnalyzer.bucket_summary(self.hourly[0], self.hourly[1].astype(np.int64), HOURS),
+            'daily_sales': SalesAnalyzer.bucket_summary(self.daily[0], self.daily[1].astype(np.int64), DAY_NAMES),
+            'daily_totals': SalesAnalyzer.iso_keyed(self.daily_totals.sort_index().round(2))
+        }
+    
+    def item_performance(self) -> Dict[str, Any]:
+        """Same result as SalesAnalyzer.analyze_item_performance"""
+        if not self.mapping.item_name:
+            return {"error": "Item name column required"}
+        
+        item_counts = self.item_counts if self.item_counts is not None else pd.Series(dtype=np.int64)
+        result = SalesAnalyzer.summarize_item_counts(item_counts.index, item_counts.to_numpy(dtype=np.int64))
+        
+        if self.item_revenue is not None:
+            item_revenue = SalesAnalyzer.with_mean(self.item_revenue)[['sum', 'mean', 'count']]
+            result['top_revenue_items'] = item_revenue.nlargest(10, 'sum').to_dict('index')
+            result['highest_avg_price_items'] = item_revenue.nlargest(10, 'mean').to_dict('index')
+        
+        return result
+
 class ReportGenerator:
     """Generate comprehensive reports"""
     
     @staticmethod
-    def generate_summary_report(df: pd.DataFrame, mapping: ColumnMapping) -> Dict[str, Any]:
-        """Generate a comprehensive summary report"""
+    def generate_summary_report(df: pd.DataFrame, mapping: ColumnMapping, cache: Dict = None) -> Dict[str, Any]:
+        """Generate a comprehensive summary report
+        
+        Cleaned columns are shared between the analyses through cache, so each is cleaned once.
+        They are filled in up front, so the sections can then run side by side on threads
+        (pandas and numpy release the GIL in their kernels) and only ever read the cache.
+        The item and order sections may start numba's own thread pool, which must not be
+        entered from two threads at once, so they run one after the other on this thread.
+        """
+        if cache is None:
+            cache = {}
+        
+        DataCleaner.missing_counts(df, cache)
+        if mapping.price:
+            DataCleaner.get_clean(df, mapping.price, 'currency', cache)
+            if mapping.date:
+                DataCleaner.get_clean(df, mapping.date, 'date', cache)
+        if mapping.item_name:
+            DataCleaner.get_clean(df, mapping.item_name, 'text', cache)
+        
+        sections = {
+            'data_overview': lambda: DataLoader.inspect_data(df, cache),
+            'basic_metrics': lambda: SalesAnalyzer.calculate_basic_metrics(df, mapping, cache),
+            'temporal_analysis': lambda: SalesAnalyzer.analyze_temporal_patterns(df, mapping, cache)
+        }
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {name: executor.submit(section) for name, section in sections.items()}
+            results = {
+                'item_performance': SalesAnalyzer.analyze_item_performance(df, mapping, cache),
+                'order_analysis': OrderAnalyzer.analyze_order_composition(df, mapping)
+            }
+            results.update((name, future.result()) for name, future in futures.items())
         
         report = {
-            'data_overview': DataLoader.inspect_data(df),
+            'data_overview': results['data_overview'],
             'column_mapping': mapping.__dict__,
-            'basic_metrics': SalesAnalyzer.calculate_basic_metrics(df, mapping),
-            'temporal_analysis': SalesAnalyzer.analyze_temporal_patterns(df, mapping),
-            'item_performance': SalesAnalyzer.analyze_item_performance(df, mapping),
-            'order_analysis': OrderAnalyzer.analyze_order_composition(df, mapping),
+            'basic_metrics': results['basic_metrics'],
+            'temporal_analysis': results['temporal_analysis'],
+            'item_performance': results['item_performance'],
+            'order_analysis': results['order_analysis'],
             'generated_at': datetime.now().isoformat()
         }
         
@@ -327,8 +747,15 @@ class ReportGenerator:
     @staticmethod
     def save_report(report: Dict[str, Any], output_path: str = "restaurant_analysis_report.json"):
         """Save report to JSON file"""
-        with open(output_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        if orjson is not None:
+            options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(report, default=str, option=options))
+        else:
+            # Encode the whole report first so it reaches the file in one write, not one per token
+            text = json.dumps(report, indent=2, default=str)
+            with open(output_path, 'w') as f:
+                f.write(text)
         print(f"📄 Report saved to {output_path}")
 
 # Main analysis class that ties everything together
@@ -337,13 +764,87 @@ class RestaurantDataAnalyzer:
     
     def __init__(self):
         self.data = None
+        self.sample = None
+        self.sample_source = None  # (file_path, sheet_name) the sample was read from
+        self.mapped_columns_only = False  # True once load_mapped_data skipped the unmapped columns
+        self.sample_excel = None  # workbook the sample was read from, kept open for the full read
         self.mapping = None
         self.report = None
+        self._clean_cache = {}  # Cleaned columns and null counts of the current data, keyed by (id(df), column, kind)
+    
+    def load_data(self, file_path: str, sheet_name: str = None, downcast: bool = False,
+                  excel_file: pd.ExcelFile = None) -> bool:
+        """Load data from file, or from an Excel workbook already opened from it"""
+        self._close_sample_excel()
+        try:
+            self.data = DataLoader.load_file(file_path, sheet_name, downcast, excel_file)
+            self.sample = self.sample_source = None
+            self.mapped_columns_only = False
+            self._clean_cache.clear()
+            return True
+        except Exception as e:
+            print(f"❌ Error loading data: {e}")
+            return False
     
-    def load_data(self, file_path: str, sheet_name: str = None) -> bool:
-        """Load data from file"""
+    def load_sample(self, file_path: str, sheet_name: str = None, excel_file: pd.ExcelFile = None,
+                    nrows: int = SAMPLE_ROWS) -> bool:
+        """Load the first rows of a file to inspect and map; load_mapped_data reads the rest
+        
+        Until then self.data is the sample, so the columns can be previewed and mapped
+        without parsing the whole file. An excel_file passed in is owned by the analyzer from
+        then on: it stays open so load_mapped_data reads the rows from the same workbook, and
+        is closed by the next load_sample or load_data.
+        """
+        self._close_sample_excel()
         try:
-            self.data = DataLoader.load_file(file_path, sheet_name)
+            self.sample = DataLoader.load_file(file_path, sheet_name, excel_file=excel_file, nrows=nrows)
+            self.data = self.sample
+            self.sample_source = (file_path, sheet_name)
+            self.sample_excel = excel_file
+            self.mapped_columns_only = False
+            self._clean_cache.clear()
+            return True
+        except Exception as e:
+            if excel_file is not None:
+                excel_file.close()
+            print(f"❌ Error loading data: {e}")
+            return False
+    
+    def _close_sample_excel(self):
+        """Close the workbook kept from load_sample, if any"""
+        if self.sample_excel is not None:
+            self.sample_excel.close()
+            self.sample_excel = None
+    
+    def load_mapped_data(self, full_rows: bool = True, downcast: bool = False) -> bool:
+        """Replace a sample from load_sample with every row of the file
+        
+        Every column is read when full_rows is set. Removing duplicate rows, or rows with
+        missing values, compares whole rows, so it needs full_rows. Without it only the mapped
+        columns are parsed, since they are the only ones the analysis reads. The report's data
+        overview is then marked mapped_columns_only. Does nothing after load_data, or when the
+        data from an earlier call already has the columns needed.
+        """
+        if self.sample_source is None:
+            return True
+        
+        columns = None
+        if not full_rows and self.mapping is not None:
+            mapped = dict.fromkeys(self.mapping.__dict__.values())
+            columns = [column for column in mapped if column in self.sample.columns] or None
+        
+        if self.data is not self.sample:
+            if not self.mapped_columns_only:
+                return True
+            if columns is not None and set(columns).issubset(self.data.columns):
+                return True
+        
+        file_path, sheet_name = self.sample_source
+        try:
+            self.data = DataLoader.load_file(file_path, sheet_name, downcast, self.sample_excel,
+                                             usecols=columns)
+            self.mapped_columns_only = columns is not None
+            self._clean_cache.clear()
             return True
         except Exception as e:
             print(f"❌ Error loading data: {e}")
@@ -353,7 +854,7 @@ class RestaurantDataAnalyzer:
         """Inspect the loaded data"""
         if self.data is None:
             return {"error": "No data loaded"}
-        return DataLoader.inspect_data(self.data)
+        return DataLoader.inspect_data(self.data, self._clean_cache)
     
     def auto_map_columns(self) -> ColumnMapping:
         """Automatically detect column mappings"""
@@ -393,9 +894,14 @@ class RestaurantDataAnalyzer:
         if remove_duplicates:
             cleaned_data = DataCleaner.remove_duplicates(cleaned_data)
         
-        cleaned_data = DataCleaner.handle_missing_values(cleaned_data, handle_missing)
+        # With no rows removed the null counts are those of the loaded data, often already computed
+        missing_summary = None
+        if len(cleaned_data) == len(self.data):
+            missing_summary = DataCleaner.missing_counts(self.data, self._clean_cache)
+        cleaned_data = DataCleaner.handle_missing_values(cleaned_data, handle_missing, missing_summary)
         
         self.data = cleaned_data
+        self._clean_cache.clear()
         return cleaned_data
     
     def generate_analysis(self) -> Dict[str, Any]:
@@ -403,7 +909,54 @@ class RestaurantDataAnalyzer:
         if self.data is None or self.mapping is None:
             return {"error": "Data and column mapping required"}
         
-        self.report = ReportGenerator.generate_summary_report(self.data, self.mapping)
+        self.report = ReportGenerator.generate_summary_report(self.data, self.mapping, self._clean_cache)
+        if self.mapped_columns_only:
+            # Shape, missing values and memory below cover the mapped columns, not the whole file
+            self.report['data_overview']['mapped_columns_only'] = True
+        return self.report
+    
+    def analyze_streaming(self, file_path: str, chunksize: int = 500_000) -> Dict[str, Any]:
+        """Analyze a large CSV chunk by chunk instead of loading it into memory
+        
+        The report has the basic metrics, temporal and item sections. The data overview and
+        order analysis need the whole table, so they are left out. Columns are auto-detected
+        from the first chunk unless a mapping was set beforehand.
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            return {"error": f"File not found: {file_path}"}
+        
+        # Like load_file: sniffed encoding first, latin-1 if a later chunk doesn't decode
+        encodings = [DataLoader.sniff_encoding(file_path), 'latin-1']
+        for encoding in dict.fromkeys(encodings):
+            try:
+                # Detection only looks at column names, so the header row is enough
+                columns = pd.read_csv(file_path, encoding=encoding, nrows=0)
+                if self.mapping is None:
+                    self.mapping = ColumnMapper.auto_detect_columns(columns)
+                # Keep item names as text even in a chunk where they are all blank
+                dtype = {self.mapping.item_name: object} if self.mapping.item_name in columns else None
+                
+                streamed = StreamingReport(self.mapping)
+                for chunk in pd.read_csv(file_path, encoding=encoding, chunksize=chunksize, dtype=dtype):
+                    streamed.update(chunk)
+                break
+            except UnicodeDecodeError:
+                continue
+        else:
+            return {"error": "Could not read CSV with any encoding"}
+        
+        if streamed.row_count == 0:
+            return {"error": f"No records found in {file_path}"}
+        print(f"✅ Streamed CSV with {encoding} encoding: {streamed.row_count} rows")
+        
+        self.report = {
+            'column_mapping': self.mapping.__dict__,
+            'basic_metrics': streamed.basic_metrics(),
+            'temporal_analysis': streamed.temporal_patterns(),
+            'item_performance': streamed.item_performance(),
+            'generated_at': datetime.now().isoformat()
+        }
         return self.report
     
     def save_report(self, output_path: str = "restaurant_analysis_report.json"):
@@ -1,14 +1,39 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import pandas as pd
-import json
+import importlib.util
 from pathlib import Path
 import threading
+import queue
+from collections import defaultdict
 from typing import Dict, Any, Optional
 
-# Import your foundation classes
-from restaurant_data_foundation import RestaurantDataAnalyzer, ColumnMapping
+# The foundation classes (and pandas with them) are imported on the worker thread by create_analyzer,
+# so the window opens without waiting for them
+
+# Status updates from worker threads are coalesced and applied at most once a frame (~60Hz)
+STATUS_FLUSH_MS = 16
+
+# Tcl lambda inserting a list of rows into a treeview, so the preview is filled in one call into Tcl
+TREE_INSERT_ROWS = "{tree rows} {foreach row $rows {$tree insert {} end -values $row}}"
+
+# Fixed-layout result blocks, filled with format_map; a metric missing from the report shows as 0
+BASIC_METRICS_TEMPLATE = (
+    "📊 BASIC METRICS:\n"
+    "  • Total Revenue: ${total_revenue:,.2f}\n"
+    "  • Total Transactions: {transaction_count:,}\n"
+    "  • Average Transaction: ${average_transaction:.2f}\n"
+    "  • Largest Transaction: ${max_transaction:.2f}\n"
+    "  • Smallest Transaction: ${min_transaction:.2f}\n\n"
+)
+ORDER_PATTERNS_TEMPLATE = (
+    "🛒 ORDER PATTERNS:\n"
+    "  • Total Orders: {total_orders:,}\n"
+    "  • Average Items per Order: {average_items_per_order:.1f}\n"
+    "  • Average Order Value: ${average_order_value:.2f}\n"
+    "  • Largest Order: ${largest_order_value:.2f}\n"
+    "  • Single Item Orders: {single_item_orders:,}\n\n"
+)
 
 class RestaurantAnalysisGUI:
     def __init__(self):
@@ -16,18 +41,40 @@ class RestaurantAnalysisGUI:
         ctk.set_appearance_mode("system")  # or "dark" or "light"
         ctk.set_default_color_theme("blue")
         
-        # Initialize analyzer
-        self.analyzer = RestaurantDataAnalyzer()
+        # Initialize analyzer - created by create_analyzer once the window is up
+        self.analyzer = None
         self.current_file = None
         
+        # Latest status message/progress queued by worker threads, applied on the main thread
+        self._status_lock = threading.Lock()
+        self._pending_status = None
+        self._pending_progress = None
+        self._status_flush_pending = False
+        
+        # One worker runs load/map/analyze/export tasks in turn, so they never race on the analyzer's data.
+        # It is a daemon thread, so closing the window doesn't wait for a running task
+        self.closing = False
+        self._tasks = queue.Queue()
+        self._worker = threading.Thread(target=self._run_tasks, name="rda", daemon=True)
+        self._worker.start()
+        
         # Create main window
         self.root = ctk.CTk()
         self.root.title("Restaurant Data Analysis Tool")
         self.root.geometry("1200x800")
         self.root.minsize(1000, 600)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
         self.setup_ui()
         
+        # Queued ahead of any load, which the single worker only runs after it
+        self._tasks.put((self.create_analyzer, None))
+        
+    def create_analyzer(self):
+        """Import the analysis foundation and create the analyzer, off the UI thread"""
+        from restaurant_data_foundation import RestaurantDataAnalyzer
+        self.analyzer = RestaurantDataAnalyzer()
+    
     def setup_ui(self):
         """Set up the user interface"""
         # Configure grid
@@ -263,10 +310,57 @@ class RestaurantAnalysisGUI:
     
     def update_status(self, message: str, progress: float = None):
         """Update status bar"""
+        if self.closing:
+            return
+        with self._status_lock:
+            # Only the newest message and progress matter; one flush covers every update queued until it runs
+            self._pending_status = message
+            if progress is not None:
+                self._pending_progress = progress
+            if self._status_flush_pending:
+                return
+            self._status_flush_pending = True
+        
+        self.root.after(STATUS_FLUSH_MS, self._flush_status)
+    
+    def _flush_status(self):
+        """Apply the latest queued status to the status bar"""
+        with self._status_lock:
+            message, progress = self._pending_status, self._pending_progress
+            self._pending_progress = None
+            self._status_flush_pending = False
+        
+        if self.closing:
+            return
         self.status_label.configure(text=message)
         if progress is not None:
             self.progress_bar.set(progress)
     
+    def run_task(self, task, button):
+        """Run task on the worker thread, with the button that started it disabled until it finishes"""
+        button.configure(state="disabled")
+        self._tasks.put((task, button))
+    
+    def _run_tasks(self):
+        """Worker thread loop: run the queued tasks one at a time"""
+        while True:
+            task, button = self._tasks.get()
+            if self.closing:
+                continue  # Nothing left to show the results in
+            try:
+                task()
+            except Exception as e:
+                # The tasks report their own errors; this is create_analyzer failing to import,
+                # which the next load retries and reports
+                print(f"Background task failed: {e}")
+            if button is not None and not self.closing:
+                self.root.after(0, lambda button=button: button.configure(state="normal"))
+    
+    def close(self):
+        """Close the window; a task still running skips its remaining widget updates"""
+        self.closing = True
+        self.root.destroy()
+    
     def load_file(self):
         """Load data file"""
         file_path = filedialog.askopenfilename(
@@ -286,24 +380,33 @@ class RestaurantAnalysisGUI:
             try:
                 self.update_status("Loading file...", 0.2)
                 
-                # Handle Excel sheet selection
+                # Already imported by create_analyzer; if that failed, retrying here reports why
+                import pandas as pd
+                from restaurant_data_foundation import EXCEL_ENGINE
+                if self.analyzer is None:
+                    self.create_analyzer()
+                
+                # Handle Excel sheet selection - the workbook opened to list the sheets is
+                # handed to the analyzer, so it isn't read from disk a second time
+                excel_file = None
+                sheet_name = None
                 if file_path.lower().endswith(('.xlsx', '.xls')):
-                    excel_file = pd.ExcelFile(file_path)
+                    excel_file = pd.ExcelFile(file_path, engine=EXCEL_ENGINE)
                     if len(excel_file.sheet_names) > 1:
                         sheet_name = self.select_excel_sheet(excel_file.sheet_names)
                         if not sheet_name:
+                            excel_file.close()
                             self.update_status("Ready", 0)
                             return
-                    else:
-                        sheet_name = None
-                else:
-                    sheet_name = None
                 
                 self.update_status("Processing data...", 0.5)
                 
-                # Load data
-                success = self.analyzer.load_data(file_path, sheet_name)
+                # Load a sample to preview and map - the mapped columns are read in full by run_analysis.
+                # The analyzer keeps excel_file open for that read and closes it on the next load.
+                success = self.analyzer.load_sample(file_path, sheet_name, excel_file=excel_file)
                 
+                if self.closing:
+                    return
                 if success:
                     self.current_file = file_path
                     self.file_label.configure(text=Path(file_path).name, text_color="green")
@@ -326,13 +429,13 @@ class RestaurantAnalysisGUI:
                     messagebox.showerror("Error", "Failed to load the selected file")
                 
             except Exception as e:
+                if self.closing:
+                    return  # The error most likely came from the destroyed widgets
                 self.update_status("Error loading file", 0)
                 messagebox.showerror("Error", f"Error loading file: {str(e)}")
         
         # Run in thread to prevent UI freezing
-        thread = threading.Thread(target=load_thread)
-        thread.daemon = True
-        thread.start()
+        self.run_task(load_thread, self.load_button)
     
     def select_excel_sheet(self, sheet_names):
         """Dialog to select Excel sheet"""
@@ -379,43 +482,48 @@ Memory Usage: {data_info['memory_usage'] / 1024:.1f} KB
 Missing Values: {sum(data_info['missing_values'].values())} total
 
 Columns: {', '.join(data_info['columns'])}"""
+        if self.analyzer.data is self.analyzer.sample:
+            info_text += "\n\nShowing the first rows of the file - the whole file is loaded when the analysis runs."
         
         self.data_info_text.delete("1.0", "end")
         self.data_info_text.insert("1.0", info_text)
         
         # Update data preview tree
         df = self.analyzer.data.head(10)
+        columns = df.columns.tolist()
+        # One bulk conversion instead of a Series per row; each column keeps its own type
+        rows = df.to_numpy(dtype=object, na_value="").tolist()
         
         # Clear existing data
-        for item in self.data_tree.get_children():
-            self.data_tree.delete(item)
+        self.data_tree.delete(*self.data_tree.get_children())
         
         # Configure columns
-        self.data_tree["columns"] = list(df.columns)
+        self.data_tree["columns"] = columns
         self.data_tree["show"] = "headings"
         
         # Configure column headings and widths
-        for col in df.columns:
+        for col in columns:
             self.data_tree.heading(col, text=col)
             self.data_tree.column(col, width=100, minwidth=50)
         
-        # Insert data
-        for index, row in df.iterrows():
-            self.data_tree.insert("", "end", values=list(row))
+        # Insert data - the rows go over as one Tcl list, each cell quoted as Treeview.insert would
+        self.data_tree.tk.call("apply", TREE_INSERT_ROWS, self.data_tree._w, rows)
     
     def create_mapping_widgets(self):
         """Create column mapping widgets"""
-        # Clear existing widgets
-        for widget in self.mapping_widgets.values():
-            widget.destroy()
-        self.mapping_widgets.clear()
-        
         if self.analyzer.data is None:
             return
         
         # Get available columns
         columns = [""] + list(self.analyzer.data.columns)
         
+        # The fields never change, so after the first file just swap in the new columns
+        if self.mapping_widgets:
+            for var, dropdown in self.mapping_widgets.values():
+                dropdown.configure(values=columns)
+                var.set("")
+            return
+        
         # Create mapping widgets for each field
         fields = [
             ("date", "Date/Time Column"),
@@ -449,13 +557,15 @@ Columns: {', '.join(data_info['columns'])}"""
     
     def auto_map_columns(self):
         """Auto-detect column mappings"""
-        if self.analyzer.data is None:
+        if self.analyzer is None or self.analyzer.data is None:
             return
         
         def map_thread():
             try:
                 self.update_status("Auto-detecting columns...", 0.5)
                 mapping = self.analyzer.auto_map_columns()
+                if self.closing:
+                    return
                 
                 # Update mapping widgets
                 for field_name, (var, dropdown) in self.mapping_widgets.items():
@@ -474,12 +584,12 @@ Columns: {', '.join(data_info['columns'])}"""
                 self.analyze_button.configure(state="normal")
                 
             except Exception as e:
+                if self.closing:
+                    return
                 self.update_status("Error in auto-mapping", 0)
                 messagebox.showerror("Error", f"Error in auto-mapping: {str(e)}")
         
-        thread = threading.Thread(target=map_thread)
-        thread.daemon = True
-        thread.start()
+        self.run_task(map_thread, self.auto_map_button)
     
     def open_column_mapping(self):
         """Open manual column mapping"""
@@ -501,18 +611,35 @@ Columns: {', '.join(data_info['columns'])}"""
                 if mapping_dict:
                     self.analyzer.set_column_mapping(**mapping_dict)
                 
+                self.update_status("Loading data...", 0.3)
+                
+                # Duplicate and missing-value row removal compare whole rows, so they need every column;
+                # otherwise only the mapped columns are parsed from the file
+                remove_duplicates = self.remove_duplicates_var.get()
+                handle_missing = self.missing_data_var.get()
+                full_rows = remove_duplicates or handle_missing == "drop_rows"
+                loaded = self.analyzer.load_mapped_data(full_rows)
+                if self.closing:
+                    return
+                if not loaded:
+                    self.update_status("Failed to load file", 0)
+                    messagebox.showerror("Error", "Failed to load the selected file")
+                    return
+                
                 self.update_status("Cleaning data...", 0.4)
                 
                 # Clean data
                 self.analyzer.clean_data(
-                    remove_duplicates=self.remove_duplicates_var.get(),
-                    handle_missing=self.missing_data_var.get()
+                    remove_duplicates=remove_duplicates,
+                    handle_missing=handle_missing
                 )
                 
                 self.update_status("Running analysis...", 0.7)
                 
                 # Generate analysis
                 report = self.analyzer.generate_analysis()
+                if self.closing:
+                    return
                 
                 self.update_status("Formatting results...", 0.9)
                 
@@ -528,12 +655,12 @@ Columns: {', '.join(data_info['columns'])}"""
                 self.tabview.set("Analysis Results")
                 
             except Exception as e:
+                if self.closing:
+                    return
                 self.update_status("Error in analysis", 0)
                 messagebox.showerror("Error", f"Error in analysis: {str(e)}")
         
-        thread = threading.Thread(target=analysis_thread)
-        thread.daemon = True
-        thread.start()
+        self.run_task(analysis_thread, self.analyze_button)
     
     def display_results(self, report: Dict[str, Any]):
         """Display analysis results"""
@@ -541,79 +668,69 @@ Columns: {', '.join(data_info['columns'])}"""
         self.results_text.delete("1.0", "end")
         
         # Format and display results
-        result_text = "🍕 RESTAURANT DATA ANALYSIS RESULTS\n"
-        result_text += "=" * 50 + "\n\n"
+        parts = ["🍕 RESTAURANT DATA ANALYSIS RESULTS\n"]
+        parts.append("=" * 50 + "\n\n")
         
         # Basic metrics
         if 'basic_metrics' in report and 'error' not in report['basic_metrics']:
-            metrics = report['basic_metrics']
-            result_text += "📊 BASIC METRICS:\n"
-            result_text += f"  • Total Revenue: ${metrics.get('total_revenue', 0):,.2f}\n"
-            result_text += f"  • Total Transactions: {metrics.get('transaction_count', 0):,}\n"
-            result_text += f"  • Average Transaction: ${metrics.get('average_transaction', 0):.2f}\n"
-            result_text += f"  • Largest Transaction: ${metrics.get('max_transaction', 0):.2f}\n"
-            result_text += f"  • Smallest Transaction: ${metrics.get('min_transaction', 0):.2f}\n\n"
+            parts.append(BASIC_METRICS_TEMPLATE.format_map(defaultdict(int, report['basic_metrics'])))
         
         # Temporal analysis
         if 'temporal_analysis' in report and 'error' not in report['temporal_analysis']:
             temporal = report['temporal_analysis']
-            result_text += "⏰ TIME PATTERNS:\n"
+            parts.append("⏰ TIME PATTERNS:\n")
             if 'date_range' in temporal:
                 date_range = temporal['date_range']
-                result_text += f"  • Date Range: {date_range.get('start')} to {date_range.get('end')}\n"
-                result_text += f"  • Total Days: {date_range.get('total_days', 0)}\n"
+                parts.append(f"  • Date Range: {date_range.get('start')} to {date_range.get('end')}\n")
+                parts.append(f"  • Total Days: {date_range.get('total_days', 0)}\n")
             
             if 'hourly_sales' in temporal:
                 hourly = temporal['hourly_sales']
                 if 'sum' in hourly:
-                    best_hour = max(hourly['sum'].items(), key=lambda x: x[1])
-                    result_text += f"  • Peak Hour: {best_hour[0]}:00 (${best_hour[1]:,.2f})\n"
+                    best_hour = max(hourly['sum'], key=hourly['sum'].get)
+                    parts.append(f"  • Peak Hour: {best_hour}:00 (${hourly['sum'][best_hour]:,.2f})\n")
             
             if 'daily_sales' in temporal:
                 daily = temporal['daily_sales']
                 if 'sum' in daily:
-                    best_day = max(daily['sum'].items(), key=lambda x: x[1])
-                    result_text += f"  • Best Day: {best_day[0]} (${best_day[1]:,.2f})\n"
-            result_text += "\n"
+                    best_day = max(daily['sum'], key=daily['sum'].get)
+                    parts.append(f"  • Best Day: {best_day} (${daily['sum'][best_day]:,.2f})\n")
+            parts.append("\n")
         
         # Item performance
         if 'item_performance' in report and 'error' not in report['item_performance']:
             items = report['item_performance']
-            result_text += "🍽️ MENU PERFORMANCE:\n"
-            result_text += f"  • Total Unique Items: {items.get('total_unique_items', 0)}\n"
+            parts.append("🍽️ MENU PERFORMANCE:\n")
+            parts.append(f"  • Total Unique Items: {items.get('total_unique_items', 0)}\n")
             
             if 'most_ordered_items' in items:
-                result_text += "  • Top 5 Most Ordered:\n"
+                parts.append("  • Top 5 Most Ordered:\n")
                 for i, (item, count) in enumerate(list(items['most_ordered_items'].items())[:5], 1):
-                    result_text += f"    {i}. {item}: {count} orders\n"
+                    parts.append(f"    {i}. {item}: {count} orders\n")
             
             if 'top_revenue_items' in items:
-                result_text += "  • Top 5 Revenue Generators:\n"
+                parts.append("  • Top 5 Revenue Generators:\n")
                 for i, (item, stats) in enumerate(list(items['top_revenue_items'].items())[:5], 1):
                     revenue = stats.get('sum', 0) if isinstance(stats, dict) else stats
-                    result_text += f"    {i}. {item}: ${revenue:,.2f}\n"
-            result_text += "\n"
+                    parts.append(f"    {i}. {item}: ${revenue:,.2f}\n")
+            parts.append("\n")
         
         # Order analysis
         if 'order_analysis' in report and 'error' not in report['order_analysis']:
-            orders = report['order_analysis']
-            result_text += "🛒 ORDER PATTERNS:\n"
-            result_text += f"  • Total Orders: {orders.get('total_orders', 0):,}\n"
-            result_text += f"  • Average Items per Order: {orders.get('average_items_per_order', 0):.1f}\n"
-            result_text += f"  • Average Order Value: ${orders.get('average_order_value', 0):.2f}\n"
-            result_text += f"  • Largest Order: ${orders.get('largest_order_value', 0):.2f}\n"
-            result_text += f"  • Single Item Orders: {orders.get('single_item_orders', 0):,}\n\n"
+            parts.append(ORDER_PATTERNS_TEMPLATE.format_map(defaultdict(int, report['order_analysis'])))
         
         # Data overview
         if 'data_overview' in report:
             overview = report['data_overview']
-            result_text += "📋 DATA QUALITY:\n"
-            result_text += f"  • Dataset Shape: {overview.get('shape', [0, 0])[0]} rows × {overview.get('shape', [0, 0])[1]} columns\n"
+            parts.append("📋 DATA QUALITY:\n")
+            parts.append(f"  • Dataset Shape: {overview.get('shape', [0, 0])[0]} rows × {overview.get('shape', [0, 0])[1]} columns\n")
             total_missing = sum(overview.get('missing_values', {}).values())
-            result_text += f"  • Missing Values: {total_missing:,}\n"
-            result_text += f"  • Memory Usage: {overview.get('memory_usage', 0) / 1024:.1f} KB\n"
+            parts.append(f"  • Missing Values: {total_missing:,}\n")
+            parts.append(f"  • Memory Usage: {overview.get('memory_usage', 0) / 1024:.1f} KB\n")
+            if overview.get('mapped_columns_only'):
+                parts.append("  • Only the mapped columns were read from the file\n")
         
-        self.results_text.insert("1.0", result_text)
+        self.results_text.insert("1.0", "".join(parts))
     
     def export_report(self):
         """Export analysis report"""
@@ -630,12 +747,25 @@ Columns: {', '.join(data_info['columns'])}"""
             ]
         )
         
-        if file_path:
+        if not file_path:
+            return
+        
+        def export_thread():
             try:
+                self.update_status("Saving report...", 0.5)
                 self.analyzer.save_report(file_path)
+                if self.closing:
+                    return
+                self.update_status("Report saved", 1.0)
                 messagebox.showinfo("Success", f"Report saved to {file_path}")
             except Exception as e:
+                if self.closing:
+                    return
+                self.update_status("Error saving report", 0)
                 messagebox.showerror("Error", f"Error saving report: {str(e)}")
+        
+        # Serializing a large report can take a while - keep it off the UI thread
+        self.run_task(export_thread, self.export_button)
     
     def run(self):
         """Start the GUI application"""
@@ -643,6 +773,11 @@ Columns: {', '.join(data_info['columns'])}"""
 
 def main():
     """Main function to run the application"""
+    # Fail fast if pandas is missing, without paying for the import itself
+    if importlib.util.find_spec("pandas") is None:
+        print("pandas not installed. Install it with: pip install pandas")
+        return
+    
     try:
         app = RestaurantAnalysisGUI()
         app.run()